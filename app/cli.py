@@ -0,0 +1,51 @@
+"""
+Command line entry points.
+
+    python -m app.cli import employees extract.csv
+    python -m app.cli import teams teams.ndjson --chunk-size 1000
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.constants import IMPORT_CHUNK_SIZE
+from app.database import SessionLocal, create_schema, engine
+from app.employees import services as employee_services
+from app.teams import services as team_services
+
+IMPORTERS = {
+    "employees": employee_services.import_employees,
+    "teams": team_services.import_teams,
+}
+
+
+def import_file(target: str, path: Path, import_format: str, chunk_size: int) -> int:
+    rejected = 0
+    with path.open(encoding="utf-8-sig", newline="") as lines:
+        for event in IMPORTERS[target](lines, import_format, SessionLocal(), chunk_size):
+            print(json.dumps(event), flush=True)
+            if event["event"] == "summary":
+                rejected = event["rejected"]
+    return 1 if rejected else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import employees or teams from a CSV or NDJSON file")
+    import_parser.add_argument("target", choices=sorted(IMPORTERS))
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument("--format", choices=["csv", "ndjson"],
+                               help="File format, defaults to the file extension")
+    import_parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    args = parser.parse_args(argv)
+    create_schema(engine)
+    import_format = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    return import_file(args.target, args.path, import_format, args.chunk_size)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
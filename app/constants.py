@@ -1 +1,15 @@
 TEAM_DELETED = "Team deleted successfully"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+EXPORT_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+MAX_BULK_SIZE = 5000
+BULK_CHUNK_SIZE = 500
+
+IMPORT_CHUNK_SIZE = 500
+
+JSON_MEDIA_TYPE = "application/json"
+GZIP_MIN_SIZE = 1024
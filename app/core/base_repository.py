@@ -1,7 +1,15 @@
-from typing import TypeVar, Generic, Type, List, Any
-from sqlalchemy.orm import Session
+from typing import TypeVar, Generic, Type, List, Any, Iterator, Iterable, Callable, Sequence
+from sqlalchemy import select, insert, update, delete, inspect, or_, Row
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from pydantic import BaseModel
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.constants import BULK_CHUNK_SIZE
+from app.core.cache import RepositoryCache
+from app.core.versioning import VersionRegistry
+from app.loggers import logger
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -9,34 +17,336 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType], id_field: str = "id"):
+    def __init__(self, model: Type[ModelType], id_field: str = "id",
+                 unique_exceptions: dict[str, Callable[[Any], Exception]] | None = None,
+                 foreign_key_exceptions: dict[str, Callable[[Any], Exception]] | None = None,
+                 cache: RepositoryCache | None = None, versions: VersionRegistry | None = None,
+                 eager_relationships: Sequence[str] = ()):
+        """
+        ``unique_exceptions`` maps a column with a UNIQUE constraint to the exception raised, with the
+        offending value, when ``create``/``update`` violate it; other integrity errors propagate as is.
+        ``foreign_key_exceptions`` does the same for foreign key columns. SQLite does not name the column
+        that failed, so the first mapped column written with a non-null value is blamed.
+
+        ``cache`` makes ``get_by_field`` read-through: rows are cached as column snapshots keyed by
+        ``(table, field, value)`` and every write made through this repository invalidates them.
+
+        ``versions`` is bumped after every write, per table and per row keyed by ``id_field``, for ETags.
+
+        ``eager_relationships`` names many-to-one relationships joined into every read and loaded after every
+        write, so serializing rows that expose related columns never issues one lazy load per row.
+        """
         self.model = model
         self.id_field = id_field
+        self.key_field = inspect(model).primary_key[0].key
+        self.unique_exceptions = unique_exceptions or {}
+        self.foreign_key_exceptions = foreign_key_exceptions or {}
+        self.cache = cache
+        self.versions = versions
+        self.eager_relationships = tuple(eager_relationships)
+        self._cached_fields: set[str] = set()
 
     def create(self, obj_in: CreateSchemaType, db: Session) -> ModelType:
+        constraint_values = self._constraint_values(obj_in)
         try:
             db.add(obj_in)
             db.commit()
             db.refresh(obj_in)
         except IntegrityError as e:
+            error = self._translate_integrity_error(e, constraint_values)
             db.rollback()
-            raise e
+            raise error
+        self._invalidate([self._snapshot(obj_in)])
+        self._load_eager(obj_in, db)
         return obj_in
 
+    def insert_returning(self, values: dict, db: Session) -> ModelType:
+        """
+        Create a row with a single ``INSERT ... RETURNING`` and return it attached to ``db``,
+        without the follow-up SELECT that ``create``'s refresh costs.
+        """
+        constraint_values = {column: values.get(column) for column in self._constraint_columns()}
+        table = self.model.__table__
+        try:
+            row = db.execute(insert(table).values(**values).returning(*table.columns)).one()
+            db.commit()
+        except IntegrityError as e:
+            error = self._translate_integrity_error(e, constraint_values)
+            db.rollback()
+            raise error
+        self._invalidate([row._mapping])
+        db_obj = self.model(**row._mapping)
+        make_transient_to_detached(db_obj)
+        db.add(db_obj)
+        self._load_eager(db_obj, db)
+        return db_obj
+
+    def update_returning(self, db_obj: ModelType, values: dict, db: Session) -> ModelType:
+        """Apply ``values`` to ``db_obj``'s row with a single ``UPDATE ... RETURNING`` and reload it from the result."""
+        constraint_values = {**self._constraint_values(db_obj),
+                             **{column: values[column] for column in self._constraint_columns() if column in values}}
+        previous = self._snapshot(db_obj)
+        table = self.model.__table__
+        key = table.columns[self.key_field]
+        try:
+            row = db.execute(update(table).where(key == getattr(db_obj, self.key_field))
+                             .values(**values).returning(*table.columns)).one()
+            db.commit()
+        except IntegrityError as e:
+            error = self._translate_integrity_error(e, constraint_values)
+            db.rollback()
+            raise error
+        self._invalidate([previous, row._mapping], cascade=True)
+        self._set_committed_row(db_obj, row)
+        self._load_eager(db_obj, db)
+        return db_obj
+
     def get_all(self, db: Session) -> List[ModelType]:
-        return db.query(self.model).all()
+        return db.query(self.model).options(*self._eager_options()).all()
+
+    def get_page(self, after_key: int | None, limit: int, db: Session, **filters: Any) -> List[ModelType]:
+        """
+        Return up to ``limit`` rows ordered by primary key, starting after ``after_key`` (keyset seek).
+        ``filters`` are column equalities; an index on them followed by the primary key keeps the seek cheap.
+        """
+        key = getattr(self.model, self.key_field)
+        query = db.query(self.model).options(*self._eager_options()).filter_by(**filters)
+        if after_key is not None:
+            query = query.filter(key > after_key)
+        return query.order_by(key).limit(limit).all()
+
+    def stream_all(self, batch_size: int, db: Session) -> Iterator[ModelType]:
+        """Yield every row in primary key order, fetching ``batch_size`` rows at a time from the cursor."""
+        key = getattr(self.model, self.key_field)
+        statement = (select(self.model).options(*self._eager_options()).order_by(key)
+                     .execution_options(yield_per=batch_size))
+        yield from db.scalars(statement)
 
     def get_by_field(self, field_name: str, id_: str | int, db: Session) -> ModelType | None:
-        if not hasattr(self.model, field_name):
-            raise AttributeError(f"{self.model.__name__} has no field '{field_name}'")
-        field = getattr(self.model, field_name)
-        return db.query(self.model).filter(field == id_).first()
+        field = self._get_field(field_name)
+        if self.cache is None:
+            return db.query(self.model).options(*self._eager_options()).filter(field == id_).first()
+
+        key = (self.model.__tablename__, field_name, id_)
+        snapshot = self.cache.get(key)
+        if snapshot is not None:
+            return db.merge(self._restore(snapshot), load=False)
+        self._cached_fields.add(field_name)
+        generation = self.cache.generation(key[0])
+        db_obj = db.query(self.model).options(*self._eager_options()).filter(field == id_).first()
+        if db_obj is not None:
+            self.cache.set(key, self._snapshot(db_obj), generation)
+        return db_obj
+
+    def get_existing_values(self, field_name: str, values: Iterable[Any], db: Session) -> set:
+        """Return the subset of ``values`` already stored in ``field_name``, one IN query per chunk."""
+        field = self._get_field(field_name)
+        values = list(values)
+        existing = set()
+        for start in range(0, len(values), BULK_CHUNK_SIZE):
+            existing.update(db.scalars(select(field).where(field.in_(values[start:start + BULK_CHUNK_SIZE]))))
+        return existing
+
+    def bulk_insert(self, rows: List[dict], db: Session) -> List[Any]:
+        """Insert ``rows`` as one executemany in a single transaction and return their primary keys in order."""
+        if not rows:
+            return []
+        key = getattr(self.model, self.key_field)
+        try:
+            keys = db.scalars(insert(self.model).returning(key, sort_by_parameter_order=True), rows).all()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise self._translate_integrity_error(e, {})
+        except SQLAlchemyError:
+            # e.g. a lock timeout part way through: leave the session usable, without the rows written so far
+            db.rollback()
+            raise
+        self._invalidate(rows)
+        return list(keys)
+
+    def upsert(self, rows: List[dict], conflict_field: str, db: Session) -> List[str]:
+        """
+        Insert or update each row with one ``INSERT ... ON CONFLICT(conflict_field) DO UPDATE`` statement,
+        all in a single transaction. Rows whose stored values already match are left untouched.
+
+        Returns "inserted", "updated" or "unchanged" for each row, in order.
+        """
+        existing = self.get_existing_values(conflict_field, [row[conflict_field] for row in rows], db)
+        key = getattr(self.model, self.key_field)
+        outcomes = []
+        try:
+            for row in rows:
+                statement = sqlite_insert(self.model).values(**row)
+                changed_columns = [column for column in row if column != conflict_field]
+                statement = statement.on_conflict_do_update(
+                    index_elements=[conflict_field],
+                    set_={column: statement.excluded[column] for column in changed_columns},
+                    where=or_(*(getattr(self.model, column).is_distinct_from(statement.excluded[column])
+                                for column in changed_columns)),
+                ).returning(key)
+                written = db.execute(statement).first()
+                if row[conflict_field] not in existing:
+                    outcomes.append("inserted")
+                    existing.add(row[conflict_field])
+                else:
+                    outcomes.append("updated" if written else "unchanged")
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise self._translate_integrity_error(e, {})
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        self._invalidate(rows, cascade=True)
+        return outcomes
+
+    def delete_by_field_values(self, field_name: str, values: Iterable[Any], db: Session) -> set:
+        """
+        Delete every row whose ``field_name`` is in ``values`` with one ``DELETE ... WHERE IN`` per chunk,
+        all in a single transaction, without loading the rows. Returns the values that were deleted.
+        """
+        field = self._get_field(field_name)
+        values = list(values)
+        deleted = set()
+        try:
+            for start in range(0, len(values), BULK_CHUNK_SIZE):
+                statement = (delete(self.model)
+                             .where(field.in_(values[start:start + BULK_CHUNK_SIZE]))
+                             .returning(field)
+                             .execution_options(synchronize_session=False))
+                deleted.update(db.scalars(statement))
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise e
+        self._invalidate([{field_name: value} for value in deleted], cascade=True)
+        return deleted
 
     def delete(self, db_obj: ModelType, db: Session) -> None:
+        snapshot = self._snapshot(db_obj)
         db.delete(db_obj)
         db.commit()
+        self._invalidate([snapshot], cascade=True)
 
     def update(self, db_obj: UpdateSchemaType, db: Session) -> ModelType:
-        db.commit()
+        constraint_values = self._constraint_values(db_obj)
+        try:
+            db.commit()
+        except IntegrityError as e:
+            error = self._translate_integrity_error(e, constraint_values)
+            db.rollback()
+            raise error
+        # The pre-update values are gone after the flush, so drop every cached row of the table
+        self._invalidate(None, cascade=True)
         db.refresh(db_obj)
+        self._load_eager(db_obj, db)
+        return db_obj
+
+    def _invalidate(self, rows: Iterable[Any] | None, cascade: bool = False) -> None:
+        """
+        Drop cached entries and bump versions after a committed write. ``rows`` are column mappings of the rows
+        before and/or after the write; without them, or when they lack a field the cache or the row versions are
+        keyed by, the whole table is invalidated. ``cascade`` also invalidates tables whose foreign keys point
+        here: deletes may null their keys and updates change the related columns their rows are served with.
+        """
+        table = self.model.__tablename__
+        rows = None if rows is None else list(rows)
+        tables = [table, *self._dependent_tables()] if cascade else [table]
+        if self.versions is not None:
+            if rows is None or any(self.id_field not in row for row in rows):
+                self.versions.bump(table)
+            else:
+                self.versions.bump(table, {row[self.id_field] for row in rows})
+            for dependent in tables[1:]:
+                self.versions.bump(dependent)
+        if self.cache is None:
+            return
+        cached_fields = tuple(self._cached_fields)
+        if rows is None or any(field not in row for row in rows for field in cached_fields):
+            self.cache.delete_table(table)
+        else:
+            for row in rows:
+                for field in cached_fields:
+                    self.cache.delete((table, field, row[field]))
+        for dependent in tables[1:]:
+            self.cache.delete_table(dependent)
+
+    def _dependent_tables(self) -> List[str]:
+        table = self.model.__table__
+        return [other.name for other in table.metadata.tables.values()
+                if any(foreign_key.references(table) for foreign_key in other.foreign_keys)]
+
+    def _eager_options(self) -> List[Any]:
+        return [joinedload(getattr(self.model, name)) for name in self.eager_relationships]
+
+    def _load_eager(self, db_obj: ModelType, db: Session) -> None:
+        # Load them here, on the caller's thread, rather than lazily while the response is serialized. A many-to-one
+        # lazy load looks in the identity map first, so a related row already in the session costs no SELECT.
+        for name in self.eager_relationships:
+            db.expire(db_obj, [name])
+            getattr(db_obj, name)
+
+    def _snapshot(self, db_obj: ModelType) -> dict[str, Any]:
+        """Column values of ``db_obj``, plus those of its loaded eager relationships under the relationship name."""
+        snapshot = {column.key: getattr(db_obj, column.key) for column in inspect(self.model).column_attrs}
+        for name in self.eager_relationships:
+            if name in db_obj.__dict__:
+                related = db_obj.__dict__[name]
+                snapshot[name] = None if related is None else {
+                    column.key: getattr(related, column.key) for column in inspect(related).mapper.column_attrs}
+        return snapshot
+
+    def _restore(self, snapshot: dict[str, Any]) -> ModelType:
+        # Detached instances with a clean state, so Session.merge(load=False) can attach them without a SELECT
+        relationships = inspect(self.model).relationships
+        db_obj = self.model(**{key: value for key, value in snapshot.items() if key not in relationships})
+        for name in self.eager_relationships:
+            if name in snapshot:
+                related = snapshot[name]
+                if related is not None:
+                    related = relationships[name].mapper.class_(**related)
+                    make_transient_to_detached(related)
+                set_committed_value(db_obj, name, related)
+        make_transient_to_detached(db_obj)
         return db_obj
+
+    @staticmethod
+    def _set_committed_row(db_obj: ModelType, row: Row) -> None:
+        # Populates the attributes commit() just expired, so reading them does not trigger a refresh
+        for column, value in row._mapping.items():
+            set_committed_value(db_obj, column, value)
+
+    def _constraint_columns(self) -> List[str]:
+        return [*self.unique_exceptions, *self.foreign_key_exceptions]
+
+    def _constraint_values(self, db_obj: Any) -> dict[str, Any]:
+        # Read before writing: a failed flush expires the object, losing the values that caused it
+        return {column: getattr(db_obj, column, None) for column in self._constraint_columns()}
+
+    def _translate_integrity_error(self, error: IntegrityError, constraint_values: dict[str, Any]) -> Exception:
+        """
+        Map ``error`` to the configured exception. Multi-row writes pass no values: a unique violation then
+        propagates as is, and a foreign key violation raises the first mapped exception without a value.
+        """
+        message = str(error.orig)
+        if message == "FOREIGN KEY constraint failed" and self.foreign_key_exceptions:
+            column = next((column for column in self.foreign_key_exceptions
+                           if constraint_values.get(column) is not None), next(iter(self.foreign_key_exceptions)))
+            value = constraint_values.get(column)
+            logger.warning(f"{self.model.__name__} write failed: {column} {value} does not exist.")
+            return self.foreign_key_exceptions[column](value)
+        prefix = f"UNIQUE constraint failed: {self.model.__tablename__}."
+        if not message.startswith(prefix):
+            return error
+        column = message[len(prefix):]
+        if column not in self.unique_exceptions or column not in constraint_values:
+            return error
+        value = constraint_values[column]
+        logger.warning(f"{self.model.__name__} write failed: {column} {value} already exists.")
+        return self.unique_exceptions[column](value)
+
+    def _get_field(self, field_name: str) -> Any:
+        if not hasattr(self.model, field_name):
+            raise AttributeError(f"{self.model.__name__} has no field '{field_name}'")
+        return getattr(self.model, field_name)
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+
+from app.core.metrics import register_cache
+
+
+class RepositoryCache(Protocol):
+    """Interface BaseRepository expects from a cache; keys are ``(table, field, value)`` tuples."""
+
+    def generation(self, table: str) -> int: ...
+
+    def get(self, key: tuple) -> Any | None: ...
+
+    def set(self, key: tuple, value: Any, generation: int) -> None: ...
+
+    def delete(self, key: tuple) -> None: ...
+
+    def delete_table(self, table: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with a size bound and an optional TTL, keyed by tuples whose first item is a table name.
+
+    Each table has a generation that every invalidation bumps. ``set`` takes the generation the caller read
+    before loading the value and drops the value if the table was written in the meantime, so a slow reader
+    cannot put back a row that a concurrent writer just invalidated.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def get(self, key: tuple) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: tuple, value: Any, generation: int) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: tuple) -> None:
+        with self._lock:
+            self._bump(key[0])
+            self._entries.pop(key, None)
+
+    def delete_table(self, table: str) -> None:
+        with self._lock:
+            self._bump(table)
+            for key in [key for key in self._entries if key[0] == table]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+    def _bump(self, table: str) -> None:
+        self._generations[table] = self._generations.get(table, 0) + 1
+
+
+def build_repository_cache() -> LRUCache | None:
+    max_size = int(os.getenv("REPOSITORY_CACHE_SIZE", "1024"))
+    if max_size <= 0:
+        return None
+    return LRUCache(max_size, float(os.getenv("REPOSITORY_CACHE_TTL", "30")) or None)
+
+
+repository_cache = build_repository_cache()
+if repository_cache is not None:
+    register_cache("repository", repository_cache)
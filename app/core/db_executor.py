@@ -0,0 +1,107 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.core.metrics import executor_rejections, executor_run, executor_wait
+from app.exceptions import DatabaseBusyException
+from app.loggers import logger
+
+T = TypeVar("T")
+
+
+class ExecutorStats:
+    """
+    Running totals of queue wait and run time for calls made through a DatabaseExecutor, also recorded in the
+    ``db_executor_*`` metrics under the executor's name.
+    """
+
+    def __init__(self, name: str):
+        self._labels = (name,)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+        self.max_run = 0.0
+
+    def record(self, wait: float, run: float) -> None:
+        executor_wait.observe(self._labels, wait)
+        executor_run.observe(self._labels, run)
+        with self._lock:
+            self.calls += 1
+            self.total_wait += wait
+            self.total_run += run
+            self.max_wait = max(self.max_wait, wait)
+            self.max_run = max(self.max_run, run)
+
+    def record_rejection(self) -> None:
+        executor_rejections.inc(self._labels)
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "total_wait": self.total_wait,
+                "total_run": self.total_run,
+                "max_wait": self.max_wait,
+                "max_run": self.max_run,
+            }
+
+
+class DatabaseExecutor:
+    """
+    Size-limited thread pool for blocking database work.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more wait for a
+    worker; anything beyond that is rejected with DatabaseBusyException (HTTP 503).
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "db"):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.stats = ExecutorStats(name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-executor")
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if not self._slots.acquire(blocking=False):
+            self.stats.record_rejection()
+            logger.warning(f"DB executor saturated, rejecting call to {func.__name__}")
+            raise DatabaseBusyException()
+
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            try:
+                return context.run(func, *args)
+            finally:
+                self.stats.record(started - submitted, time.perf_counter() - started)
+                self._slots.release()
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except RuntimeError:
+            # The pool refused the job (e.g. after shutdown), so call() will never release its slot
+            self._slots.release()
+            raise
+        return await future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+db_executor = DatabaseExecutor(
+    max_workers=int(os.getenv("DB_EXECUTOR_MAX_WORKERS", "4")),
+    max_queue=int(os.getenv("DB_EXECUTOR_MAX_QUEUE", "64")),
+)
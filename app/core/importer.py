@@ -0,0 +1,205 @@
+import codecs
+import csv
+import json
+import time
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Literal, NamedTuple
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.db_executor import db_executor
+from app.loggers import logger
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# Failures that lose one chunk's writes but leave the import able to carry on with the next chunk
+CHUNK_ERRORS = (SQLAlchemyError, HTTPException)
+
+
+class ImportRecord(NamedTuple):
+    row: int
+    data: dict | None
+    error: str | None = None
+
+
+class ChunkResult(NamedTuple):
+    accepted: int
+    rejected: list[ImportRecord]
+
+
+def iter_records(lines: Iterable[str], import_format: ImportFormat, first_row: int = 1) -> Iterator[ImportRecord]:
+    """
+    Parse CSV (with a header row) or NDJSON lines one record at a time, numbering them from ``first_row``;
+    bad lines become error records.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(lines)
+        for row_number, data in enumerate(reader, start=first_row):
+            if None in data:
+                yield ImportRecord(row_number, None, "Row has more columns than the header")
+            else:
+                yield ImportRecord(row_number, {key: value or None for key, value in data.items()})
+        return
+
+    row_number = first_row - 1
+    for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield ImportRecord(row_number, None, f"Invalid JSON: {e}")
+            continue
+        if isinstance(data, dict):
+            yield ImportRecord(row_number, data)
+        else:
+            yield ImportRecord(row_number, None, "Expected a JSON object")
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+
+
+class ImportReport:
+    """Running totals of an import and the report events describing it."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = self.accepted = self.rejected = self.failed = self.chunks = 0
+
+    def chunk_imported(self, chunk: list[ImportRecord], result: ChunkResult) -> Iterator[dict]:
+        """One "progress" event for the chunk, then one "rejected" event per rejected row."""
+        self.chunks += 1
+        self.rows += len(chunk)
+        self.accepted += result.accepted
+        self.rejected += len(result.rejected)
+        yield {"event": "progress", "chunk": self.chunks, "rows": self.rows, "accepted": self.accepted,
+               "rejected": self.rejected, "rows_per_second": self._rate()}
+        for record in result.rejected:
+            yield {"event": "rejected", "row": record.row, "error": record.error}
+
+    def chunk_failed(self, chunk: list[ImportRecord], error: Exception) -> dict:
+        """An "error" event for a chunk none of whose rows were written."""
+        self.chunks += 1
+        self.rows += len(chunk)
+        self.failed += len(chunk)
+        detail = error.detail if isinstance(error, HTTPException) else str(getattr(error, "orig", None) or error)
+        logger.warning(f"Import chunk {self.chunks} (rows {chunk[0].row}-{chunk[-1].row}) failed: {detail}")
+        return {"event": "error", "chunk": self.chunks, "first_row": chunk[0].row, "last_row": chunk[-1].row,
+                "error": detail}
+
+    def summary(self) -> dict:
+        return {"event": "summary", "rows": self.rows, "accepted": self.accepted, "rejected": self.rejected,
+                "failed": self.failed, "seconds": round(time.perf_counter() - self.started, 3),
+                "rows_per_second": self._rate()}
+
+    def _rate(self) -> float | None:
+        elapsed = time.perf_counter() - self.started
+        return round(self.rows / elapsed, 1) if elapsed else None
+
+
+def run_import(records: Iterable[ImportRecord], chunk_size: int,
+               import_chunk: Callable[[list[ImportRecord]], ChunkResult]) -> Iterator[dict]:
+    """
+    Feed ``records`` to ``import_chunk`` ``chunk_size`` at a time and yield report events as it goes:
+    one "progress" event per chunk, one "rejected" event per rejected row, an "error" event for each chunk
+    that failed as a whole, and a final "summary".
+    """
+    report = ImportReport()
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        try:
+            result = import_chunk(chunk)
+        except CHUNK_ERRORS as e:
+            yield report.chunk_failed(chunk, e)
+            continue
+        yield from report.chunk_imported(chunk, result)
+    yield report.summary()
+
+
+async def stream_import(request: Request, import_format: ImportFormat,
+                        import_chunk: Callable[[list[ImportRecord], Session], ChunkResult], db: Session,
+                        chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    ``run_import`` over a request body as NDJSON report lines. The body is parsed as it arrives, so a chunk
+    is written while the rest of the upload is still on the wire, and every chunk runs on the db executor.
+    """
+    report = ImportReport()
+    try:
+        async for chunk in iter_record_chunks(iter_request_lines(request), import_format, chunk_size):
+            try:
+                result = await db_executor.run(import_chunk, chunk, db)
+            except CHUNK_ERRORS as e:
+                yield encode_event(report.chunk_failed(chunk, e))
+                continue
+            for event in report.chunk_imported(chunk, result):
+                yield encode_event(event)
+    except UnicodeDecodeError as e:
+        logger.warning(f"Import stopped: {e}")
+        yield encode_event({"event": "error", "error": f"Body is not valid UTF-8: {e}"})
+    finally:
+        db.close()
+    yield encode_event(report.summary())
+
+
+async def iter_request_lines(request: Request) -> AsyncIterator[str]:
+    """Decode the request body as UTF-8 (dropping a BOM) and yield it line by line as it is received."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for block in request.stream():
+        *lines, pending = (pending + decoder.decode(block)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_record_chunks(lines: AsyncIterable[str], import_format: ImportFormat,
+                             chunk_size: int) -> AsyncIterator[list[ImportRecord]]:
+    """Parse ``lines`` into chunks of ``chunk_size`` records, each one as soon as its last line has arrived."""
+    header = []
+    batch = []
+    records = []
+    yielded = 0
+    async for line in _iter_whole_records(lines, import_format):
+        if import_format == "csv" and not header:
+            header.append(line)
+            continue
+        batch.append(line)
+        if len(batch) < chunk_size:
+            continue
+        records.extend(iter_records(header + batch, import_format, first_row=yielded + len(records) + 1))
+        batch.clear()
+        while len(records) >= chunk_size:
+            yield records[:chunk_size]
+            records = records[chunk_size:]
+            yielded += chunk_size
+    records.extend(iter_records(header + batch, import_format, first_row=yielded + len(records) + 1))
+    for start in range(0, len(records), chunk_size):
+        yield records[start:start + chunk_size]
+
+
+async def _iter_whole_records(lines: AsyncIterable[str], import_format: ImportFormat) -> AsyncIterator[str]:
+    # A quoted CSV field may span lines; a record is complete once its quotes are balanced
+    text = ""
+    quotes = 0
+    async for line in lines:
+        text += line
+        if import_format == "csv":
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+        yield text
+        text = ""
+        quotes = 0
+    if text:
+        yield text
+
+
+def encode_event(event: dict) -> bytes:
+    return (json.dumps(event) + "\n").encode()
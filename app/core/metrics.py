@@ -0,0 +1,206 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Every thread records into its own shard (a dict only that thread writes), so increments take no lock, and
+label values are kept as given: names, escaping and formatting only happen when ``/metrics`` is scraped.
+"""
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._shards_lock:  # Once per thread
+                self._shards.append(values)
+            return values
+
+    def _snapshots(self) -> list[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() runs under the GIL, so it never sees a shard halfway through a write
+        return [shard.copy() for shard in shards]
+
+    def samples(self) -> Iterator[tuple[str, tuple, Any]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[tuple[str, tuple, Any]]:
+        totals: dict[tuple, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        for labels, value in totals.items():
+            yield self.name, _label_pairs(self.label_names, labels), value
+
+
+class Gauge(Counter):
+    """A counter that can go down; the exposed value is the sum of every thread's increments."""
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+
+    def observe(self, labels: tuple, value: float) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # One count per bucket plus +Inf, then the sum
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterator[tuple[str, tuple, Any]]:
+        totals: dict[tuple, list] = {}
+        for shard in self._snapshots():
+            for labels, series in shard.items():
+                total = totals.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    total[index] += value
+        for labels, series in totals.items():
+            pairs = _label_pairs(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series):
+                cumulative += count
+                yield f"{self.name}_bucket", (*pairs, ("le", _format_bound(bound))), cumulative
+            yield f"{self.name}_sum", pairs, series[-1]
+            yield f"{self.name}_count", pairs, cumulative
+
+
+class CallbackMetric(_Metric):
+    """A counter or gauge read from ``callback`` at scrape time, which returns a value per label tuple."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...],
+                 callback: Callable[[], dict[tuple, float]], kind: str = "gauge"):
+        super().__init__(name, documentation, label_names)
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self) -> Iterator[tuple[str, tuple, Any]]:
+        for labels, value in self.callback().items():
+            yield self.name, _label_pairs(self.label_names, labels), value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, pairs, value in metric.samples():
+                lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+caches: dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Expose the hit, miss and eviction counts and the hit ratio of a cache with a ``stats()`` method."""
+    caches[name] = cache
+
+
+def _cache_stats(field: str) -> Callable[[], dict[tuple, float]]:
+    return lambda: {(name,): cache.stats()[field] for name, cache in caches.items()}
+
+
+def _cache_hit_ratios() -> dict[tuple, float]:
+    ratios = {}
+    for name, cache in caches.items():
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        ratios[(name,)] = stats["hits"] / lookups if lookups else 0.0
+    return ratios
+
+
+def _label_pairs(label_names: tuple[str, ...], labels: tuple) -> tuple[tuple[str, Any], ...]:
+    return tuple(zip(label_names, labels))
+
+
+def _format_labels(pairs: Iterable[tuple[str, Any]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics_registry = MetricsRegistry()
+
+request_duration = metrics_registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency by route template.", ("method", "route")))
+requests_total = metrics_registry.register(Counter(
+    "http_requests_total", "Responses by route template and status code.", ("method", "route", "status")))
+requests_in_flight = metrics_registry.register(Gauge(
+    "http_requests_in_flight", "Requests being handled."))
+pool_checkout_wait = metrics_registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection.", ("pool",),
+    buckets=POOL_WAIT_BUCKETS))
+executor_wait = metrics_registry.register(Histogram(
+    "db_executor_wait_seconds", "Time calls spent queued for a database executor worker.", ("executor",),
+    buckets=POOL_WAIT_BUCKETS))
+executor_run = metrics_registry.register(Histogram(
+    "db_executor_run_seconds", "Time calls spent running on a database executor worker.", ("executor",)))
+executor_rejections = metrics_registry.register(Counter(
+    "db_executor_rejections_total", "Calls turned away because the database executor was saturated.",
+    ("executor",)))
+metrics_registry.register(CallbackMetric(
+    "cache_hits_total", "Cache lookups that found an entry.", ("cache",), _cache_stats("hits"), "counter"))
+metrics_registry.register(CallbackMetric(
+    "cache_misses_total", "Cache lookups that found nothing.", ("cache",), _cache_stats("misses"), "counter"))
+metrics_registry.register(CallbackMetric(
+    "cache_evictions_total", "Entries evicted to stay under the cache size.", ("cache",), _cache_stats("evictions"),
+    "counter"))
+metrics_registry.register(CallbackMetric(
+    "cache_hit_ratio", "Share of lookups served from the cache.", ("cache",), _cache_hit_ratios))
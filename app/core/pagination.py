@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+from typing import Generic, List, NamedTuple, TypeVar
+
+from app.exceptions import InvalidCursorException
+
+ItemType = TypeVar("ItemType")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple, Generic[ItemType]):
+    items: List[ItemType]
+    next_cursor: str | None
+
+
+def encode_cursor(key: int) -> str:
+    """Encode the last seen primary key as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps({"k": key}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))["k"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorException(cursor)
+    if not isinstance(key, int) or isinstance(key, bool):
+        raise InvalidCursorException(cursor)
+    return key
+
+
+def build_page(rows: List[ItemType], limit: int, key_field: str) -> Page[ItemType]:
+    """Turn up to ``limit + 1`` rows fetched by a keyset query into a page and its next cursor."""
+    if len(rows) <= limit:
+        return Page(rows, None)
+    items = rows[:limit]
+    return Page(items, encode_cursor(getattr(items[-1], key_field)))
@@ -0,0 +1,78 @@
+import gzip
+import os
+from typing import Any, Callable, NamedTuple
+
+from fastapi import Request, Response
+
+from app.constants import GZIP_MIN_SIZE, JSON_MEDIA_TYPE
+from app.core.cache import LRUCache
+from app.core.db_executor import db_executor
+from app.core.metrics import register_cache
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    gzipped: bytes | None
+    next_cursor: str | None
+
+
+def build_response_cache() -> LRUCache | None:
+    max_size = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+    if max_size <= 0:
+        return None
+    return LRUCache(max_size)
+
+
+response_cache = build_response_cache()
+if response_cache is not None:
+    register_cache("response", response_cache)
+GZIP_RESPONSES = os.getenv("RESPONSE_CACHE_GZIP", "true").lower() == "true"
+
+
+def encode_body(body: bytes, next_cursor: str | None = None) -> CachedBody:
+    """Pair the encoded body with its gzip form, unless gzip is off or the body is too small to gain from it."""
+    gzipped = None
+    if GZIP_RESPONSES and len(body) >= GZIP_MIN_SIZE:
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+    return CachedBody(body, gzipped, next_cursor)
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def to_response(entry: CachedBody, request: Request, etag: str) -> Response:
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if entry.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = entry.next_cursor
+    if entry.gzipped is not None and accepts_gzip(request):
+        headers["Content-Encoding"] = "gzip"
+        return Response(entry.gzipped, media_type=JSON_MEDIA_TYPE, headers=headers)
+    return Response(entry.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+async def cached_list_response(request: Request, table: str, etag: str,
+                               load: Callable[..., tuple[bytes, str | None]], *args: Any) -> Response:
+    """
+    Serve a list endpoint from encoded bodies cached per table version, path and query string.
+
+    ``etag`` is the table version read before ``load`` runs, so a body is never filed under a version older
+    than the data it holds. ``load`` returns the JSON body and the next-page cursor, if any; it runs, with
+    the compression, on the database executor.
+    """
+    key = (table, etag, request.url.path, request.url.query)
+    entry = response_cache.get(key) if response_cache is not None else None
+    if entry is None:
+        entry = await db_executor.run(_load_body, load, *args)
+        if response_cache is not None:
+            response_cache.set(key, entry, response_cache.generation(table))
+    return to_response(entry, request, etag)
+
+
+def _load_body(load: Callable[..., tuple[bytes, str | None]], *args: Any) -> CachedBody:
+    return encode_body(*load(*args))
@@ -0,0 +1,29 @@
+from functools import cache
+from typing import Any, Iterable
+
+import orjson
+from pydantic import BaseModel
+
+
+@cache
+def response_fields(model: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def dump_rows(model: type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """
+    Encode ORM rows as a JSON list shaped like ``model`` without validating them.
+
+    Only for rows read from our own tables: their column values already have the model's types, so the
+    validation FastAPI runs for ``response_model`` would be a second pass over trusted data. Fields are read
+    by attribute name; aliases and custom serializers on ``model`` are not applied.
+    """
+    fields = response_fields(model)
+    return orjson.dumps([{field: getattr(row, field) for field in fields} for row in rows])
+
+
+def dump_ndjson(model: type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """Like ``dump_rows``, one JSON object per line."""
+    fields = response_fields(model)
+    return b"".join(orjson.dumps({field: getattr(row, field) for field in fields}, option=orjson.OPT_APPEND_NEWLINE)
+                    for row in rows)
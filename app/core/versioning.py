@@ -0,0 +1,94 @@
+import threading
+import uuid
+from typing import Any, Callable, Iterable
+
+from fastapi import Request, Response
+
+from app.exceptions import NotModifiedException
+
+
+class VersionRegistry:
+    """
+    In-process version counters for tables and rows, bumped by BaseRepository after every committed write.
+
+    Tags are prefixed with an epoch drawn at startup, so counters that restart from zero never repeat a tag
+    issued by an earlier process. Writes made outside this process (another worker, the CLI) are not seen.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._tables: dict[str, int] = {}
+        self._row_generations: dict[str, int] = {}
+        self._rows: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def table_version(self, table: str) -> str:
+        return f"{self.epoch}-{self._tables.get(table, 0)}"
+
+    def row_version(self, table: str, key: Any) -> str:
+        with self._lock:
+            return f"{self.epoch}-{self._row_generations.get(table, 0)}-{self._rows.get((table, str(key)), 0)}"
+
+    def bump(self, table: str, keys: Iterable[Any] | None = None) -> None:
+        """Bump the table and the given rows; without ``keys`` every row of the table gets a new version."""
+        with self._lock:
+            self._tables[table] = self._tables.get(table, 0) + 1
+            if keys is None:
+                self._row_generations[table] = self._row_generations.get(table, 0) + 1
+                for row in [row for row in self._rows if row[0] == table]:
+                    del self._rows[row]
+                return
+            for key in keys:
+                row = (table, str(key))
+                self._rows[row] = self._rows.get(row, 0) + 1
+
+
+def make_etag(version: str) -> str:
+    # Weak, since the same version may be sent with different encodings
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def table_etag(table: str) -> Callable[[Request, Response], str]:
+    """Dependency answering ``If-None-Match`` for a collection with 304 before any row is read."""
+
+    def dependency(request: Request, response: Response) -> str:
+        etag = make_etag(version_registry.table_version(table))
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModifiedException(etag)
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency
+
+
+def row_etag(table: str, path_param: str, key_type: Callable[[str], Any] = str
+             ) -> Callable[[Request, Response], str | None]:
+    """
+    Dependency answering ``If-None-Match`` for the row named by ``path_param`` with 304 before it is read.
+    ``key_type`` converts the raw path value like the endpoint does, so ``/teams/07`` shares the tag of row 7.
+    """
+
+    def dependency(request: Request, response: Response) -> str | None:
+        try:
+            key = key_type(request.path_params[path_param])
+        except ValueError:
+            return None  # The endpoint rejects the value itself
+        etag = make_etag(version_registry.row_version(table, key))
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModifiedException(etag)
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency
+
+
+version_registry = VersionRegistry()
@@ -1,19 +1,145 @@
+import os
+import threading
+import time
+from contextvars import ContextVar
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
+from app.core.metrics import pool_checkout_wait
 
-def get_database_url():
+
+def get_database_path() -> Path:
     db_path = Path(__file__).parent.parent / "db" / "employees.db"
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    return f"sqlite:///{db_path.resolve()}"
+    return db_path.resolve()
+
+
+def get_database_url():
+    return f"sqlite:///{get_database_path()}"
+
+
+def get_read_only_database_url():
+    return f"sqlite:///file:{get_database_path()}?mode=ro&uri=true"
+
+
+def get_sqlite_pragmas() -> dict[str, str]:
+    """
+    Connection pragmas for the application engines, each overridable through an env variable
+    (set it to an empty string to leave SQLite's default in place).
+    """
+    pragmas = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # negative = KiB, i.e. 64 MiB
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+        "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "ON"),
+    }
+    return {name: value for name, value in pragmas.items() if value}
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict[str, str]) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+class QueryStats:
+    """Statements executed and seconds spent executing them, accumulated over one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(bind: Engine) -> None:
+    """Add every statement ``bind`` executes, and its duration, to the ``query_stats`` of the current context."""
+    event.listen(bind, "before_cursor_execute", _start_query_timer)
+    event.listen(bind, "after_cursor_execute", _record_query)
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(time.perf_counter() - conn.info.pop("query_started_at"))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits, labelled with the engine's ``pool_logging_name``."""
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe((self._orig_logging_name or "default",), time.perf_counter() - started_at)
 
 
 DATABASE_URL = get_database_url()
+READ_ONLY_DATABASE_URL = get_read_only_database_url()
+
+SQLITE_PRAGMAS = get_sqlite_pragmas()
+# journal_mode is a property of the database file, only the read-write engine sets it
+SQLITE_READ_ONLY_PRAGMAS = {**{name: value for name, value in SQLITE_PRAGMAS.items() if name != "journal_mode"},
+                            "query_only": "ON"}
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False},
+                       poolclass=InstrumentedQueuePool, pool_logging_name="write")
+
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, SQLITE_PRAGMAS)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Separate pool of mode=ro connections for GET traffic; under WAL these never take the write lock
+read_engine = create_engine(
+    READ_ONLY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=InstrumentedQueuePool,
+    pool_logging_name="read",
+    pool_size=int(os.getenv("SQLITE_READ_POOL_SIZE", "8")),
+    max_overflow=int(os.getenv("SQLITE_READ_POOL_OVERFLOW", "8")),
+)
+
+
+@event.listens_for(read_engine, "connect")
+def set_read_only_sqlite_pragma(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection, SQLITE_READ_ONLY_PRAGMAS)
+
+
+instrument_engine(read_engine)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
+
+
+def create_schema(bind: Engine = engine) -> None:
+    """Create missing tables, then missing indexes, which create_all skips on tables that already exist."""
+    Base.metadata.create_all(bind=bind)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
@@ -1,7 +1,17 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Request, Body, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import Field
 from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from app.constants import IMPORT_CHUNK_SIZE, MAX_PAGE_SIZE, NDJSON_MEDIA_TYPE, MAX_BULK_SIZE
+from app.core.db_executor import db_executor
+from app.core.importer import ImportFormat, stream_import
+from app.core.response_cache import cached_list_response
+from app.core.versioning import row_etag, table_etag
+from app.dependencies import get_db, get_read_db
 from app.employees import schemas as employee_schema, services
+from app.employees.models import Employee
 from app.loggers import logger
 from starlette import status
 
@@ -15,30 +25,88 @@ router = APIRouter(
 @router.post("/", response_model=employee_schema.EmployeeResponse, status_code=status.HTTP_201_CREATED)
 async def create_employee(employee_request: employee_schema.EmployeeCreateRequest, db: Session = Depends(get_db)):
     logger.info(f"Creating employee with GPN: {employee_request.gpn}")
-    new_employee = services.create_employee(employee_request, db)
+    new_employee = await db_executor.run(services.create_employee, employee_request, db)
     logger.info(f"Employee created with GPN: {new_employee.gpn}")
     return new_employee
 
 
+# Create employees in bulk
+@router.post("/bulk", response_model=employee_schema.EmployeeBulkCreateResponse)
+async def bulk_create_employees(
+        employee_requests: list[employee_schema.EmployeeCreateRequest] = Body(..., min_length=1, max_length=MAX_BULK_SIZE),
+        db: Session = Depends(get_db)):
+    logger.info(f"Bulk creating {len(employee_requests)} employees")
+    result = await db_executor.run(services.bulk_create_employees, employee_requests, db)
+    logger.info(f"Bulk create finished: {result.created} created, {result.duplicates} duplicates")
+    return result
+
+
+# Import employees from a CSV or NDJSON body
+@router.post("/import", response_class=StreamingResponse)
+async def import_employees(request: Request, import_format: ImportFormat = Query("csv", alias="format"),
+                           db: Session = Depends(get_db)):
+    logger.info(f"Importing employees from {import_format} upload")
+    report = stream_import(request, import_format, services.import_employee_chunk, db, IMPORT_CHUNK_SIZE)
+    return StreamingResponse(report, media_type=NDJSON_MEDIA_TYPE)
+
+
+# Delete employees in bulk
+@router.post("/bulk/delete", response_model=employee_schema.EmployeeBulkDeleteResponse)
+async def bulk_delete_employees(delete_request: employee_schema.EmployeeBulkDeleteRequest,
+                                db: Session = Depends(get_db)):
+    logger.info(f"Bulk deleting {len(delete_request.gpns)} employees")
+    result = await db_executor.run(services.bulk_delete_employees, delete_request.gpns, db)
+    logger.info(f"Bulk delete finished: {len(result.deleted)} deleted, {len(result.not_found)} not found")
+    return result
+
+
 # Get all employees
 @router.get("/", response_model=list[employee_schema.EmployeeResponse])
-async def get_all_employees(db: Session = Depends(get_db)):
-    logger.info("Fetching all employees")
-    return services.get_all_employees(db)
+async def get_all_employees(request: Request, limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                            cursor: str | None = None, etag: str = Depends(table_etag(Employee.__tablename__)),
+                            db: Session = Depends(get_read_db)):
+    if limit is None and cursor is None:
+        logger.info("Fetching all employees")
+    else:
+        logger.info(f"Fetching employees page after cursor {cursor}")
+    return await cached_list_response(request, Employee.__tablename__, etag, services.get_employees_json,
+                                      cursor, limit, db)
+
+
+# Export all employees as NDJSON
+@router.get("/export", response_class=StreamingResponse)
+async def export_employees(etag: str = Depends(table_etag(Employee.__tablename__)),
+                           db: Session = Depends(get_read_db)):
+    logger.info("Exporting all employees")
+    return StreamingResponse(services.export_employees(db), media_type=NDJSON_MEDIA_TYPE, headers={"ETag": etag})
 
 
 # Get employee by GPN
-@router.get("/{gpn}", response_model=employee_schema.EmployeeResponse)
-async def get_employee(gpn: str, db: Session = Depends(get_db)):
+@router.get("/{gpn}", response_model=employee_schema.EmployeeResponse,
+            dependencies=[Depends(row_etag(Employee.__tablename__, "gpn"))])
+async def get_employee(gpn: str, db: Session = Depends(get_read_db)):
     logger.info(f"Fetching employee with GPN: {gpn}")
-    return services.get_employee_by_gpn(gpn, db)
+    return await db_executor.run(services.get_employee_by_gpn, gpn, db)
+
+
+# Insert or update employees keyed by GPN
+@router.put("/upsert", response_model=employee_schema.EmployeeUpsertResponse)
+async def upsert_employees(
+        upsert_request: employee_schema.EmployeeUpsertRequest | Annotated[
+            list[employee_schema.EmployeeUpsertRequest], Field(min_length=1, max_length=MAX_BULK_SIZE)] = Body(...),
+        db: Session = Depends(get_db)):
+    employee_requests = upsert_request if isinstance(upsert_request, list) else [upsert_request]
+    logger.info(f"Upserting {len(employee_requests)} employees")
+    result = await db_executor.run(services.upsert_employees, employee_requests, db)
+    logger.info(f"Upsert finished: {result.inserted} inserted, {result.updated} updated, {result.unchanged} unchanged")
+    return result
 
 
 # Update employee
 @router.put("/{gpn}", response_model=employee_schema.EmployeeResponse)
 async def update_employee(gpn: str, updated_data: employee_schema.EmployeeUpdateRequest, db: Session = Depends(get_db)):
     logger.info(f"Updating employee with GPN: {gpn}")
-    employee = services.update_employee(gpn, updated_data, db)
+    employee = await db_executor.run(services.update_employee, gpn, updated_data, db)
     logger.info(f"Employee with GPN {gpn} updated successfully")
     return employee
 
@@ -47,6 +115,6 @@ async def update_employee(gpn: str, updated_data: employee_schema.EmployeeUpdate
 @router.delete("/{gpn}")
 async def delete_employee(gpn: str, db: Session = Depends(get_db)):
     logger.info(f"Deleting employee with GPN: {gpn}")
-    services.delete_employee(gpn, db)
+    await db_executor.run(services.delete_employee, gpn, db)
     logger.info(f"Employee with GPN {gpn} deleted successfully")
     return {"message": "Employee deleted successfully"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -12,6 +12,9 @@ class Employee(Base):
     team_id = Column(Integer, ForeignKey("teams.team_id", ondelete="SET NULL"), nullable=True)
     team = relationship("Team", back_populates="employees")
 
+    # Team rosters seek on (team_id, employee_id), so they read only that team's rows in key order
+    __table_args__ = (Index("ix_employees_team_id_employee_id", "team_id", "employee_id"),)
+
     @property
     def team_name(self):
         return self.team.team_name if self.team else None
@@ -1,10 +1,17 @@
 from app.employees import models as employee_models
 from app.employees.schemas import EmployeeBase, EmployeeCreateRequest, EmployeeUpdateRequest
 from app.core.base_repository import BaseRepository
+from app.core.cache import repository_cache
+from app.core.versioning import version_registry
+from app.exceptions import EmployeeGpnExistsException, TeamNotFoundException
 
 
 class EmployeeRepository(BaseRepository[EmployeeBase, EmployeeCreateRequest, EmployeeUpdateRequest]):
     pass
 
 
-employee_repo = EmployeeRepository(employee_models.Employee, "gpn")
+employee_repo = EmployeeRepository(employee_models.Employee, "gpn",
+                                  unique_exceptions={"gpn": EmployeeGpnExistsException},
+                                  foreign_key_exceptions={"team_id": TeamNotFoundException},
+                                  cache=repository_cache, versions=version_registry,
+                                  eager_relationships=("team",))
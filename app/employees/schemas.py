@@ -1,5 +1,9 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field, field_validator
 
+from app.constants import MAX_BULK_SIZE
+
 
 class EmployeeBase(BaseModel):
     gpn: str = Field(..., min_length=2, max_length=15)
@@ -30,11 +34,58 @@ class EmployeeUpdateRequest(EmployeeBase):
     pass
 
 
+class EmployeeUpsertRequest(EmployeeBase):
+    pass
+
+
+class EmployeeImportRow(EmployeeBase):
+    team_name: str | None = None
+
+    @field_validator("team_name")
+    @classmethod
+    def team_name_is_uppercase(cls, value: str | None) -> str | None:
+        return value.strip().upper() if value else None
+
+
+class EmployeeBulkDeleteRequest(BaseModel):
+    gpns: list[str] = Field(..., min_length=1, max_length=MAX_BULK_SIZE)
+
+    @field_validator("gpns")
+    @classmethod
+    def normalize_gpns(cls, values: list[str]) -> list[str]:
+        return list(dict.fromkeys(value.strip().upper() for value in values))
+
+
 class EmployeeResponse(BaseModel):
     employee_id: int
     gpn: str
     employee_name: str
     team_id: int | None = None
+    team_name: str | None = None
 
     class Config:
         from_attributes = True
+
+
+class EmployeeBulkResult(BaseModel):
+    gpn: str
+    status: Literal["created", "duplicate", "team_not_found"]
+    employee_id: int | None = None
+
+
+class EmployeeBulkCreateResponse(BaseModel):
+    created: int
+    duplicates: int
+    team_not_found: int
+    results: list[EmployeeBulkResult]
+
+
+class EmployeeUpsertResponse(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+class EmployeeBulkDeleteResponse(BaseModel):
+    deleted: list[str]
+    not_found: list[str]
@@ -1,38 +1,177 @@
-from typing import Type
+from typing import Type, Iterable, Iterator
+
+from pydantic import ValidationError
 
 from sqlalchemy.orm import Session
 from app.employees import models as employee_models, schemas as employee_schema
 from app.employees.repository import employee_repo
 from app.employees.models import Employee
 from app.loggers import logger
-from app.exceptions import EmployeeNotFoundException
-from app.employees import employee_util
+from app.exceptions import EmployeeNotFoundException, TeamNotFoundException
+from app.core.pagination import Page, build_page, decode_cursor
+from app.core.serialization import dump_ndjson, dump_rows
+from app.constants import DEFAULT_PAGE_SIZE, EXPORT_BATCH_SIZE, IMPORT_CHUNK_SIZE
+from app.core.importer import (ChunkResult, ImportFormat, ImportRecord, format_validation_error, iter_records,
+                               run_import)
+from app.teams.repository import team_repo
 
 
 def create_employee(employee_request: employee_schema.EmployeeCreateRequest, db: Session) -> employee_models.Employee:
-    employee_util.ensure_gpn_is_unique(employee_request.gpn, db)
-    new_employee = employee_models.Employee(
-        gpn=employee_request.gpn,
-        employee_name=employee_request.employee_name,
-        team_id=employee_request.team_id
+    return employee_repo.insert_returning(employee_request.model_dump(), db)
+
+
+def bulk_create_employees(employee_requests: list[employee_schema.EmployeeCreateRequest],
+                          db: Session) -> employee_schema.EmployeeBulkCreateResponse:
+    taken = employee_repo.get_existing_values("gpn", {request.gpn for request in employee_requests}, db)
+    missing_team_ids = _missing_team_ids({request.team_id for request in employee_requests}, db)
+    results = []
+    new_rows = []
+    for request in employee_requests:
+        if request.gpn in taken:
+            results.append(employee_schema.EmployeeBulkResult(gpn=request.gpn, status="duplicate"))
+            continue
+        if request.team_id in missing_team_ids:
+            results.append(employee_schema.EmployeeBulkResult(gpn=request.gpn, status="team_not_found"))
+            continue
+        taken.add(request.gpn)
+        results.append(employee_schema.EmployeeBulkResult(gpn=request.gpn, status="created"))
+        new_rows.append(request.model_dump())
+
+    new_ids = iter(employee_repo.bulk_insert(new_rows, db))
+    for result in results:
+        if result.status == "created":
+            result.employee_id = next(new_ids)
+
+    duplicates = sum(result.status == "duplicate" for result in results)
+    team_not_found = len(results) - len(new_rows) - duplicates
+    if duplicates:
+        logger.warning(f"Bulk create skipped {duplicates} duplicate GPN(s)")
+    if team_not_found:
+        logger.warning(f"Bulk create skipped {team_not_found} employee(s) with unknown team(s)")
+    return employee_schema.EmployeeBulkCreateResponse(created=len(new_rows), duplicates=duplicates,
+                                                      team_not_found=team_not_found, results=results)
+
+
+def upsert_employees(employee_requests: list[employee_schema.EmployeeUpsertRequest],
+                     db: Session) -> employee_schema.EmployeeUpsertResponse:
+    missing_team_ids = _missing_team_ids({request.team_id for request in employee_requests}, db)
+    if missing_team_ids:
+        logger.warning(f"Upsert rejected: {len(missing_team_ids)} team(s) not found")
+        raise TeamNotFoundException(min(missing_team_ids))
+    outcomes = employee_repo.upsert([request.model_dump() for request in employee_requests], "gpn", db)
+    return employee_schema.EmployeeUpsertResponse(
+        inserted=outcomes.count("inserted"),
+        updated=outcomes.count("updated"),
+        unchanged=outcomes.count("unchanged"),
     )
-    return employee_repo.create(new_employee, db)
+
+
+def _missing_team_ids(team_ids: set[int | None], db: Session) -> set[int]:
+    team_ids = {team_id for team_id in team_ids if team_id is not None}
+    return team_ids - team_repo.get_existing_values("team_id", team_ids, db)
 
 
 def get_all_employees(db: Session) -> list[Type[Employee]]:
     return employee_repo.get_all(db)
 
 
+def get_employees_page(cursor: str | None, limit: int, db: Session) -> Page[employee_models.Employee]:
+    rows = employee_repo.get_page(decode_cursor(cursor), limit + 1, db)
+    return build_page(rows, limit, employee_repo.key_field)
+
+
+def get_team_employees_page(team_id: int, cursor: str | None, limit: int,
+                            db: Session) -> Page[employee_models.Employee]:
+    rows = employee_repo.get_page(decode_cursor(cursor), limit + 1, db, team_id=team_id)
+    if not rows and team_repo.get_by_field("team_id", team_id, db) is None:
+        logger.warning(f"Team with ID {team_id} not found")
+        raise TeamNotFoundException(team_id)
+    return build_page(rows, limit, employee_repo.key_field)
+
+
+def get_team_employees_json(team_id: int, cursor: str | None, limit: int, db: Session) -> tuple[bytes, str | None]:
+    employees, next_cursor = get_team_employees_page(team_id, cursor, limit, db)
+    return dump_rows(employee_schema.EmployeeResponse, employees), next_cursor
+
+
+def get_employees_json(cursor: str | None, limit: int | None, db: Session) -> tuple[bytes, str | None]:
+    """Encode every employee, or one page when ``cursor`` or ``limit`` is given, with the next-page cursor."""
+    if cursor is None and limit is None:
+        employees, next_cursor = get_all_employees(db), None
+    else:
+        employees, next_cursor = get_employees_page(cursor, limit or DEFAULT_PAGE_SIZE, db)
+    return dump_rows(employee_schema.EmployeeResponse, employees), next_cursor
+
+
+def export_employees(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Yield the employee directory as NDJSON, one chunk per ``batch_size`` rows.
+
+    Meant to be consumed by a StreamingResponse after the request's dependencies have
+    finished, so the session is closed here once the stream is exhausted or abandoned.
+    """
+    try:
+        batch = []
+        for employee in employee_repo.stream_all(batch_size, db):
+            batch.append(employee)
+            if len(batch) == batch_size:
+                yield dump_ndjson(employee_schema.EmployeeResponse, batch)
+                batch.clear()
+        if batch:
+            yield dump_ndjson(employee_schema.EmployeeResponse, batch)
+    finally:
+        db.close()
+
+
+def import_employees(lines: Iterable[str], import_format: ImportFormat, db: Session,
+                     chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Upsert employees from CSV/NDJSON lines, committing every ``chunk_size`` rows, and yield report events.
+    Rows carry ``team_name`` (resolved to ``team_id`` with one lookup per chunk) or ``team_id``.
+    """
+    try:
+        records = iter_records(lines, import_format)
+        yield from run_import(records, chunk_size, lambda chunk: import_employee_chunk(chunk, db))
+    finally:
+        db.close()
+
+
+def import_employee_chunk(chunk: list[ImportRecord], db: Session) -> ChunkResult:
+    rejected = [record for record in chunk if record.error]
+    valid = []
+    for record in chunk:
+        if record.error:
+            continue
+        try:
+            valid.append((record, employee_schema.EmployeeImportRow.model_validate(record.data)))
+        except ValidationError as e:
+            rejected.append(record._replace(error=format_validation_error(e)))
+
+    team_ids = team_repo.get_ids_by_names({row.team_name for _, row in valid if row.team_name}, db)
+    known_team_ids = set(team_ids.values()) | team_repo.get_existing_values(
+        "team_id", {row.team_id for _, row in valid if row.team_id is not None and not row.team_name}, db)
+
+    rows = []
+    for record, row in valid:
+        team_id = team_ids.get(row.team_name) if row.team_name else row.team_id
+        if team_id is None and row.team_name:
+            rejected.append(record._replace(error=f"Team {row.team_name} not found"))
+        elif team_id is not None and team_id not in known_team_ids:
+            rejected.append(record._replace(error=f"Team with ID {team_id} not found"))
+        else:
+            rows.append({"gpn": row.gpn, "employee_name": row.employee_name, "team_id": team_id})
+
+    if rows:
+        employee_repo.upsert(rows, "gpn", db)
+    return ChunkResult(len(rows), sorted(rejected, key=lambda record: record.row))
+
+
 def update_employee(gpn: str, updated_data: employee_schema.EmployeeUpdateRequest,
                     db: Session) -> employee_models.Employee:
     employee = get_employee_by_gpn(gpn, db)
     if updated_data.gpn != employee.gpn:
         logger.info(f"GPN for employee {gpn} changing from {employee.gpn} to {updated_data.gpn}")
-        employee_util.ensure_gpn_is_unique(updated_data.gpn, db)
-    employee.gpn = updated_data.gpn
-    employee.employee_name = updated_data.employee_name
-    employee.team_id = updated_data.team_id
-    return employee_repo.update(employee, db)
+    return employee_repo.update_returning(employee, updated_data.model_dump(), db)
 
 
 def delete_employee(gpn: str, db: Session) -> None:
@@ -40,6 +179,15 @@ def delete_employee(gpn: str, db: Session) -> None:
     employee_repo.delete(employee, db)
 
 
+def bulk_delete_employees(gpns: list[str], db: Session) -> employee_schema.EmployeeBulkDeleteResponse:
+    deleted = employee_repo.delete_by_field_values("gpn", gpns, db)
+    not_found = [gpn for gpn in gpns if gpn not in deleted]
+    if not_found:
+        logger.warning(f"Bulk delete could not find {len(not_found)} GPN(s)")
+    return employee_schema.EmployeeBulkDeleteResponse(deleted=[gpn for gpn in gpns if gpn in deleted],
+                                                      not_found=not_found)
+
+
 def get_employee_by_gpn(gpn: str, db: Session) -> employee_models.Employee:
     employee = employee_repo.get_by_field("gpn", gpn, db)
     if not employee:
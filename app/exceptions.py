@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from starlette import status
 
+DATABASE_LOCKED_DETAIL = "Database is locked, retry later"
+
 
 class EmployeeNotFoundException(HTTPException):
     def __init__(self, gpn: str = None):
@@ -24,3 +26,28 @@ class TeamNameExistsException(HTTPException):
     def __init__(self, team_name: str = None):
         message = "Team name already exists" if team_name is None else f"Team {team_name} already exists"
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+
+class DatabaseBusyException(HTTPException):
+    def __init__(self, retry_after: int = 1):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database is busy, retry later",
+                         headers={"Retry-After": str(retry_after)})
+
+
+class DatabaseLockedException(HTTPException):
+    """SQLite gave up waiting for the write lock; the request did not happen and can be retried."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=DATABASE_LOCKED_DETAIL,
+                         headers={"Retry-After": str(retry_after)})
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self, cursor: str = None):
+        message = "Invalid cursor" if cursor is None else f"Invalid cursor {cursor}"
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+
+class NotModifiedException(HTTPException):
+    def __init__(self, etag: str):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
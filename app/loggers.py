@@ -1,19 +1,160 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+from app.core.metrics import CallbackMetric, metrics_registry
+
 
 log_dir = Path(__file__).parent.parent / "logs"
 log_dir.mkdir(exist_ok=True)
 
 log_file = log_dir / "app.log"
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a share of the records of chosen loggers (and their children), e.g. ``{"app_logger": 0.1}``.
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._resolved.get(record.name)
+        if rate is None:
+            rate = self._resolved[record.name] = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+    def _rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller: when the queue is full the record is dropped ("drop_new")
+    or the oldest queued record makes room for it ("drop_oldest"). Drops are counted and reported by the
+    writer thread once the queue drains.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop_new"):
+        super().__init__(log_queue)
+        if overflow not in ("drop_new", "drop_oldest"):
+            raise ValueError(f"Unknown log overflow policy {overflow}")
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in this process, so the record is handed over as is and formatted by the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+class DropReportingListener(QueueListener):
+    """QueueListener that logs, through its own handlers, how many records the queue handler had to drop."""
+
+    def __init__(self, log_queue: queue.Queue, queue_handler: BoundedQueueHandler, *handlers: logging.Handler):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self._reported = 0
+
+    def enqueue_sentinel(self) -> None:
+        # Blocking put: at shutdown the queue may be full, and the writer thread is still draining it
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        dropped = self.queue_handler.dropped
+        if dropped != self._reported and self.queue.empty():
+            super().handle(logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"Log queue was full, dropped {dropped - self._reported} records",
+            }))
+            self._reported = dropped
+
+
+def parse_sampling(spec: str) -> dict[str, float]:
+    """Parse ``LOG_SAMPLING``, e.g. ``"app_logger=0.1,sqlalchemy.engine=0.01"``."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def build_output_handlers(json_output: bool) -> list[logging.Handler]:
+    formatter = JsonFormatter() if json_output else logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(filename=log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+log_queue: queue.Queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+queue_handler = BoundedQueueHandler(log_queue, os.getenv("LOG_OVERFLOW", "drop_new"))
+sampling = parse_sampling(os.getenv("LOG_SAMPLING", ""))
+if sampling:
+    queue_handler.addFilter(SamplingFilter(sampling))
+
+# Request threads only enqueue; a single background thread formats and writes to the file and the console
+log_listener = DropReportingListener(log_queue, queue_handler,
+                                     *build_output_handlers(os.getenv("LOG_FORMAT", "text").lower() == "json"))
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler(filename=log_file),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler]
 )
 
+metrics_registry.register(CallbackMetric(
+    "log_records_dropped_total", "Log records dropped because the log queue was full.", (),
+    lambda: {(): queue_handler.dropped}, "counter"))
+
 logger = logging.getLogger("app_logger")
@@ -1,9 +1,76 @@
-from fastapi import Request, Response
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import request_duration, requests_in_flight, requests_total
+from app.database import QueryStats, query_stats
 from app.loggers import logger
 
+DB_QUERIES_HEADER = "X-DB-Queries"
+REQUEST_ID_HEADER = "X-Request-ID"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestLoggingMiddleware:
+    """
+    Logs the request line and the response status, duration and database work of every HTTP request, tagged
+    with a request id (the caller's ``X-Request-ID`` or a new one, echoed back), and records the request metrics.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``: the endpoint runs in the caller's task and its
+    response is streamed through untouched, headers being added as ``http.response.start`` goes by.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _header(scope, b"x-request-id") or uuid.uuid4().hex
+        method = scope["method"]
+        query = scope["query_string"]
+        target = f"{scope['path']}?{query.decode('latin-1')}" if query else scope["path"]
+        logger.info("Incoming request: %s %s [%s]", method, target, request_id)
+
+        # Work done on the db executor runs in a copy of this context, so it records into the same stats
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Streamed bodies keep running after this point, so their statements are not counted
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER] = request_id
+                headers[DB_QUERIES_HEADER] = str(stats.count)
+                headers["Server-Timing"] = f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"'
+            await send(message)
+
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            requests_in_flight.dec()
+            query_stats.reset(token)
+            duration = time.perf_counter() - started_at
+            # Labelled by route template, e.g. /employees/{gpn}, so paths with ids do not each get a series
+            route = scope.get("route")
+            labels = (method, route.path if route is not None else UNMATCHED_ROUTE)
+            request_duration.observe(labels, duration)
+            requests_total.inc((*labels, status_code))
+            logger.info("Completed response: %s in %.2f ms (%s queries, %.2f ms in db) [%s]", status_code,
+                        duration * 1000, stats.count, stats.seconds * 1000, request_id)
+
 
-async def log_requests(request: Request, call_next) -> Response:
-    logger.info(f"Incoming request: {request.method} {request.url}")
-    response = await call_next(request)
-    logger.info(f"Completed response: {response.status_code}")
-    return response
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter(
+    tags=["monitoring"]
+)
+
+
+# Prometheus scrape endpoint
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.dependencies import get_db
+from app.core.db_executor import db_executor
+from app.dependencies import get_db, get_read_db
 from app.teams import schemas as team_schema, services
-from app.constants import TEAM_DELETED
+from app.teams.models import Team
+from app.employees import schemas as employee_schema, services as employee_services
+from app.employees.models import Employee
+from app.constants import TEAM_DELETED, DEFAULT_PAGE_SIZE, IMPORT_CHUNK_SIZE, MAX_PAGE_SIZE, NDJSON_MEDIA_TYPE
+from app.core.importer import ImportFormat, stream_import
+from app.core.response_cache import cached_list_response
+from app.core.versioning import row_etag, table_etag
 from app.loggers import logger
 from starlette import status
 
@@ -16,30 +24,56 @@ router = APIRouter(
 @router.post("/", response_model=team_schema.TeamResponse, status_code=status.HTTP_201_CREATED)
 async def create_team(team_create_request: team_schema.TeamCreateRequest, db: Session = Depends(get_db)):
     logger.info(f"Creating team with name: {team_create_request.team_name}")
-    new_team = services.create_team(team_create_request.team_name, db)
+    new_team = await db_executor.run(services.create_team, team_create_request.team_name, db)
     logger.info(f"Team {new_team.team_name} created successfully with ID: {new_team.team_id}")
     return new_team
 
 
+# Import teams from a CSV or NDJSON body
+@router.post("/import", response_class=StreamingResponse)
+async def import_teams(request: Request, import_format: ImportFormat = Query("csv", alias="format"),
+                       db: Session = Depends(get_db)):
+    logger.info(f"Importing teams from {import_format} upload")
+    report = stream_import(request, import_format, services.import_team_chunk, db, IMPORT_CHUNK_SIZE)
+    return StreamingResponse(report, media_type=NDJSON_MEDIA_TYPE)
+
+
 # Get all teams
 @router.get("/", response_model=list[team_schema.TeamResponse])
-async def get_teams(db: Session = Depends(get_db)):
-    logger.info("Fetching all teams")
-    return services.get_all_teams(db)
+async def get_teams(request: Request, limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                    cursor: str | None = None, etag: str = Depends(table_etag(Team.__tablename__)),
+                    db: Session = Depends(get_read_db)):
+    if limit is None and cursor is None:
+        logger.info("Fetching all teams")
+    else:
+        logger.info(f"Fetching teams page after cursor {cursor}")
+    return await cached_list_response(request, Team.__tablename__, etag, services.get_teams_json, cursor, limit, db)
 
 
 # Get team by ID
-@router.get("/{team_id}", response_model=team_schema.TeamResponse)
-async def get_team(team_id: int, db: Session = Depends(get_db)):
+@router.get("/{team_id}", response_model=team_schema.TeamResponse,
+            dependencies=[Depends(row_etag(Team.__tablename__, "team_id", int))])
+async def get_team(team_id: int, db: Session = Depends(get_read_db)):
     logger.info(f"Fetching team with ID: {team_id}")
-    return services.get_team(team_id, db)
+    return await db_executor.run(services.get_team, team_id, db)
+
+
+# Get a team's employees, one page at a time
+@router.get("/{team_id}/employees", response_model=list[employee_schema.EmployeeResponse])
+async def get_team_employees(request: Request, team_id: int,
+                             limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: str | None = None,
+                             etag: str = Depends(table_etag(Employee.__tablename__)),
+                             db: Session = Depends(get_read_db)):
+    logger.info(f"Fetching employees of team {team_id} after cursor {cursor}")
+    return await cached_list_response(request, Employee.__tablename__, etag, employee_services.get_team_employees_json,
+                                      team_id, cursor, limit, db)
 
 
 # Update team
 @router.put("/{team_id}", response_model=team_schema.TeamResponse)
 async def update_team(team_id: int, team_update_request: team_schema.TeamUpdateRequest, db: Session = Depends(get_db)):
     logger.info(f"Updating team with ID: {team_id}")
-    team = services.update_team(team_id, team_update_request.team_name, db)
+    team = await db_executor.run(services.update_team, team_id, team_update_request.team_name, db)
     logger.info(f"Team with ID: {team_id} updated successfully")
     return team
 
@@ -48,6 +82,6 @@ async def update_team(team_id: int, team_update_request: team_schema.TeamUpdateR
 @router.delete("/{team_id}")
 async def delete_team(team_id: int, db: Session = Depends(get_db)):
     logger.info(f"Deleting team with ID: {team_id}")
-    services.delete_team(team_id, db)
+    await db_executor.run(services.delete_team, team_id, db)
     logger.info(f"Team with ID: {team_id} deleted successfully")
     return {"message": TEAM_DELETED}
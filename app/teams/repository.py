@@ -1,13 +1,23 @@
 from app.teams import models as team_models
 from app.teams.schemas import TeamBase, TeamCreateRequest, TeamUpdateRequest
 from app.core.base_repository import BaseRepository
+from app.core.cache import repository_cache
+from app.core.versioning import version_registry
+from app.exceptions import TeamNameExistsException
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 
 class TeamRepository(BaseRepository[TeamBase, TeamCreateRequest, TeamUpdateRequest]):
-    def get_team_by_name(self, team_name: str, db: Session) -> team_models.Team | None:
-        return db.query(team_models.Team).filter(team_models.Team.team_name == team_name).first()
+    def get_ids_by_names(self, team_names: set[str], db: Session) -> dict[str, int]:
+        if not team_names:
+            return {}
+        rows = db.execute(select(team_models.Team.team_name, team_models.Team.team_id)
+                          .where(team_models.Team.team_name.in_(team_names)))
+        return {team_name: team_id for team_name, team_id in rows}
 
 
-team_repo = TeamRepository(team_models.Team, "team_id")
+team_repo = TeamRepository(team_models.Team, "team_id",
+                           unique_exceptions={"team_name": TeamNameExistsException},
+                           cache=repository_cache, versions=version_registry)
@@ -1,4 +1,6 @@
-from typing import Type
+from typing import Type, Iterable, Iterator
+
+from pydantic import ValidationError
 
 from sqlalchemy.orm import Session
 from app.teams import models as team_models
@@ -6,19 +8,63 @@ from app.teams.repository import team_repo
 from app.loggers import logger
 from app.exceptions import TeamNotFoundException
 from app.teams.models import Team
-from app.teams import team_util
+from app.core.pagination import Page, build_page, decode_cursor
+from app.core.serialization import dump_rows
+from app.constants import DEFAULT_PAGE_SIZE, IMPORT_CHUNK_SIZE
+from app.core.importer import (ChunkResult, ImportFormat, ImportRecord, format_validation_error, iter_records,
+                               run_import)
+from app.teams import schemas as team_schema
 
 
 def create_team(team_name: str, db: Session) -> team_models.Team:
-    team_util.ensure_team_name_is_unique(team_name, db)
-    new_team = team_models.Team(team_name=team_name)
-    return team_repo.create(new_team, db)
+    return team_repo.insert_returning({"team_name": team_name}, db)
+
+
+def import_teams(lines: Iterable[str], import_format: ImportFormat, db: Session,
+                 chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[dict]:
+    """Create teams from CSV/NDJSON lines, committing every ``chunk_size`` rows, and yield report events."""
+    try:
+        records = iter_records(lines, import_format)
+        yield from run_import(records, chunk_size, lambda chunk: import_team_chunk(chunk, db))
+    finally:
+        db.close()
+
+
+def import_team_chunk(chunk: list[ImportRecord], db: Session) -> ChunkResult:
+    rejected = [record for record in chunk if record.error]
+    team_names = []
+    for record in chunk:
+        if record.error:
+            continue
+        try:
+            team_names.append(team_schema.TeamCreateRequest.model_validate(record.data).team_name)
+        except ValidationError as e:
+            rejected.append(record._replace(error=format_validation_error(e)))
+
+    existing = team_repo.get_existing_values("team_name", team_names, db)
+    new_team_names = [team_name for team_name in dict.fromkeys(team_names) if team_name not in existing]
+    team_repo.bulk_insert([{"team_name": team_name} for team_name in new_team_names], db)
+    return ChunkResult(len(team_names), sorted(rejected, key=lambda record: record.row))
 
 
 def get_all_teams(db: Session) -> list[Type[Team]]:
     return team_repo.get_all(db)
 
 
+def get_teams_page(cursor: str | None, limit: int, db: Session) -> Page[team_models.Team]:
+    rows = team_repo.get_page(decode_cursor(cursor), limit + 1, db)
+    return build_page(rows, limit, team_repo.key_field)
+
+
+def get_teams_json(cursor: str | None, limit: int | None, db: Session) -> tuple[bytes, str | None]:
+    """Encode every team, or one page when ``cursor`` or ``limit`` is given, with the next-page cursor."""
+    if cursor is None and limit is None:
+        teams, next_cursor = get_all_teams(db), None
+    else:
+        teams, next_cursor = get_teams_page(cursor, limit or DEFAULT_PAGE_SIZE, db)
+    return dump_rows(team_schema.TeamResponse, teams), next_cursor
+
+
 def get_team(team_id: int, db: Session) -> team_models.Team:
     team = team_repo.get_by_field("team_id", team_id, db)
     if not team:
@@ -29,9 +75,7 @@ def get_team(team_id: int, db: Session) -> team_models.Team:
 
 def update_team(team_id: int, team_name: str, db: Session) -> team_models.Team:
     team = get_team(team_id, db)
-    team_util.ensure_team_name_is_unique(team_name, db, team.team_id)
-    team.team_name = team_name
-    return team_repo.update(team, db)
+    return team_repo.update_returning(team, {"team_name": team_name}, db)
 
 
 def delete_team(team_id: int, db: Session) -> None:
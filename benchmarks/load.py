@@ -0,0 +1,328 @@
+"""
+HTTP load generator for the employee and team API.
+
+    python -m benchmarks.load [--url http://127.0.0.1:8000] [--duration 30] [--concurrency 32] [--rate 0]
+                              [--mix get_employee=35,create_employee=12,...] [--output FILE]
+
+Without ``--url`` the app in ``main.py`` is driven in-process over ASGI, against its configured database; with it,
+a running server (e.g. ``uvicorn main:app``) is. Before the run a few teams and employees are created, and only
+rows created by the generator are updated or deleted; they are all removed afterwards unless ``--keep-data``.
+
+``--rate 0`` runs a closed loop: ``--concurrency`` workers each send their next request when the previous one
+returns. A positive ``--rate`` runs an open loop with Poisson arrivals at that many requests per second, at most
+``--concurrency`` in flight; latency is measured from the scheduled arrival, so time spent queued counts.
+
+Reports throughput, latency percentiles, the error rate (5xx and transport errors), the share of requests that
+failed with ``database is locked`` (the app's 503 for it, or in-process the exception if one escapes the app)
+and the event loop lag, overall and per operation.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from app.constants import DEFAULT_PAGE_SIZE, MAX_BULK_SIZE
+from app.exceptions import DATABASE_LOCKED_DETAIL
+
+DEFAULT_MIX = ("get_employee=35,list_employees=15,get_team=10,list_teams=5,team_roster=5,create_employee=12,"
+               "update_employee=8,delete_employee=6,create_team=2,update_team=1,delete_team=1")
+LOCKED_MESSAGE = "database is locked"
+LAG_INTERVAL = 0.01
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = item.partition("=")
+        if name.strip() not in LoadGenerator.OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name.strip()}, "
+                                             f"expected one of {', '.join(LoadGenerator.OPERATIONS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Latency percentiles in ms (nearest rank)."""
+    if not latencies:
+        return {}
+    latencies = sorted(latencies)
+    at = lambda share: round(latencies[max(0, round(share * len(latencies)) - 1)] * 1000, 3)  # noqa: E731
+    return {"p50": at(0.50), "p90": at(0.90), "p99": at(0.99), "max": round(latencies[-1] * 1000, 3)}
+
+
+class OperationStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+        self.locked = 0
+
+    def report(self, elapsed: float) -> dict:
+        requests = len(self.latencies)
+        return {
+            "requests": requests,
+            "throughput_rps": round(requests / elapsed, 2),
+            "latency_ms": summarize(self.latencies),
+            "error_rate": round(self.errors / requests, 5) if requests else 0.0,
+            "locked_rate": round(self.locked / requests, 5) if requests else 0.0,
+            "status_codes": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+        }
+
+
+class LoadGenerator:
+    """Picks operations by weight, keeps the keys of the rows it created and records every outcome."""
+
+    # Operation name -> the key pool it needs, if any, and the operation run instead while that pool is empty
+    OPERATIONS: dict[str, tuple[str | None, str | None]] = {
+        "list_employees": (None, None),
+        "get_employee": ("employees", "create_employee"),
+        "create_employee": (None, None),
+        "update_employee": ("employees", "create_employee"),
+        "delete_employee": ("employees", "create_employee"),
+        "list_teams": (None, None),
+        "get_team": (None, None),
+        "team_roster": (None, None),
+        "create_team": (None, None),
+        "update_team": ("teams", "create_team"),
+        "delete_team": ("teams", "create_team"),
+    }
+
+    def __init__(self, client: httpx.AsyncClient, mix: dict[str, float], seed: int):
+        self.client = client
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.random = random.Random(seed)
+        self.run_id = seed % 10 ** 6
+        self.created = 0
+        # Seed teams are never deleted, so employees can always point at them
+        self.seed_teams: list[int] = []
+        self.pools: dict[str, list] = {"employees": [], "teams": []}
+        self.stats: dict[str, OperationStats] = {}
+
+    def pick(self) -> str:
+        name = self.random.choices(self.names, self.weights)[0]
+        pool, fallback = self.OPERATIONS[name]
+        return fallback if pool and not self.pools[pool] else name
+
+    async def call(self, name: str, started_at: float) -> None:
+        stats = self.stats.setdefault(name, OperationStats())
+        try:
+            response = await getattr(self, name)()
+        except Exception as e:  # In-process, unhandled app errors surface here
+            stats.latencies.append(time.perf_counter() - started_at)
+            stats.statuses[type(e).__name__] += 1
+            stats.errors += 1
+            stats.locked += LOCKED_MESSAGE in str(e)
+            return
+        stats.latencies.append(time.perf_counter() - started_at)
+        stats.statuses[response.status_code] += 1
+        if response.status_code >= 500:
+            stats.errors += 1
+            stats.locked += response.status_code == 503 and DATABASE_LOCKED_DETAIL in response.text
+
+    def _next_name(self, prefix: str) -> str:
+        self.created += 1
+        return f"{prefix}{self.run_id:06d}{self.created:07d}"
+
+    def _take(self, pool: str):
+        keys = self.pools[pool]
+        index = self.random.randrange(len(keys))
+        keys[index], keys[-1] = keys[-1], keys[index]
+        return keys.pop()
+
+    def _team_id(self) -> int:
+        return self.random.choice(self.seed_teams + self.pools["teams"])
+
+    async def list_employees(self) -> httpx.Response:
+        return await self.client.get("/employees/", params={"limit": DEFAULT_PAGE_SIZE})
+
+    async def get_employee(self) -> httpx.Response:
+        return await self.client.get(f"/employees/{self.random.choice(self.pools['employees'])}")
+
+    async def create_employee(self) -> httpx.Response:
+        gpn = self._next_name("L")
+        response = await self.client.post("/employees/", json={
+            "gpn": gpn, "employee_name": "Load Test", "team_id": self.random.choice(self.seed_teams)})
+        if response.status_code == 201:
+            self.pools["employees"].append(gpn)
+        return response
+
+    async def update_employee(self) -> httpx.Response:
+        gpn = self.random.choice(self.pools["employees"])
+        return await self.client.put(f"/employees/{gpn}", json={
+            "gpn": gpn, "employee_name": f"Load Test {self.created}", "team_id": self.random.choice(self.seed_teams)})
+
+    async def delete_employee(self) -> httpx.Response:
+        return await self.client.delete(f"/employees/{self._take('employees')}")
+
+    async def list_teams(self) -> httpx.Response:
+        return await self.client.get("/teams/", params={"limit": DEFAULT_PAGE_SIZE})
+
+    async def get_team(self) -> httpx.Response:
+        return await self.client.get(f"/teams/{self._team_id()}")
+
+    async def team_roster(self) -> httpx.Response:
+        return await self.client.get(f"/teams/{self.random.choice(self.seed_teams)}/employees")
+
+    async def create_team(self) -> httpx.Response:
+        response = await self.client.post("/teams/", json={"team_name": self._next_name("LT")})
+        if response.status_code == 201:
+            self.pools["teams"].append(response.json()["team_id"])
+        return response
+
+    async def update_team(self) -> httpx.Response:
+        return await self.client.put(f"/teams/{self.random.choice(self.pools['teams'])}",
+                                     json={"team_name": self._next_name("LT")})
+
+    async def delete_team(self) -> httpx.Response:
+        return await self.client.delete(f"/teams/{self._take('teams')}")
+
+    async def seed(self, teams: int, employees: int) -> None:
+        for _ in range(teams):
+            response = await self.client.post("/teams/", json={"team_name": self._next_name("LT")})
+            response.raise_for_status()
+            self.seed_teams.append(response.json()["team_id"])
+        for _ in range(employees):
+            (await self.create_employee()).raise_for_status()
+
+    async def cleanup(self) -> None:
+        gpns = self.pools["employees"]
+        for start in range(0, len(gpns), MAX_BULK_SIZE):
+            await self.client.post("/employees/bulk/delete", json={"gpns": gpns[start:start + MAX_BULK_SIZE]})
+        for team_id in self.seed_teams + self.pools["teams"]:
+            await self.client.delete(f"/teams/{team_id}")
+
+
+async def closed_loop(generator: LoadGenerator, concurrency: int, deadline: float) -> None:
+    async def worker():
+        while time.perf_counter() < deadline:
+            await generator.call(generator.pick(), time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(generator: LoadGenerator, rate: float, concurrency: int, deadline: float) -> None:
+    in_flight = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def arrival(name: str, scheduled_at: float):
+        async with in_flight:
+            await generator.call(name, scheduled_at)
+
+    scheduled_at = time.perf_counter()
+    while scheduled_at < deadline:
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(arrival(generator.pick(), scheduled_at))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        scheduled_at += generator.random.expovariate(rate)
+    await asyncio.gather(*tasks)
+
+
+async def measure_loop_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """How late the event loop wakes a task sleeping ``LAG_INTERVAL``, i.e. how long callbacks hog it."""
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - started_at - LAG_INTERVAL))
+
+
+def build_client(url: str | None, concurrency: int, timeout: float) -> httpx.AsyncClient:
+    if url:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout)
+    from main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver", timeout=timeout)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    async with build_client(args.url, args.concurrency, args.timeout) as client:
+        generator = LoadGenerator(client, args.mix, args.seed)
+        await generator.seed(args.seed_teams, args.seed_employees)
+
+        lag_samples: list[float] = []
+        stop = asyncio.Event()
+        lag_monitor = asyncio.create_task(measure_loop_lag(lag_samples, stop))
+        started_at = time.perf_counter()
+        deadline = started_at + args.duration
+        if args.rate > 0:
+            await open_loop(generator, args.rate, args.concurrency, deadline)
+        else:
+            await closed_loop(generator, args.concurrency, deadline)
+        elapsed = time.perf_counter() - started_at
+        stop.set()
+        await lag_monitor
+
+        if not args.keep_data:
+            await generator.cleanup()
+
+    total = OperationStats()
+    for stats in generator.stats.values():
+        total.latencies += stats.latencies
+        total.statuses.update(stats.statuses)
+        total.errors += stats.errors
+        total.locked += stats.locked
+    return {
+        "target": args.url or "in-process",
+        "mode": "open" if args.rate > 0 else "closed",
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "duration_s": round(elapsed, 3),
+        **total.report(elapsed),
+        "loop_lag_ms": summarize(lag_samples),
+        "operations": {name: stats.report(elapsed) for name, stats in sorted(generator.stats.items())},
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['target']}, {report['mode']} loop, concurrency {report['concurrency']}"
+          + (f", {report['rate']} req/s offered" if report["mode"] == "open" else "")
+          + f", {report['duration_s']} s")
+    print(f"{'operation':<18} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>8} {'locked':>8}")
+    for name, entry in [*report["operations"].items(), ("total", report)]:
+        latency = entry["latency_ms"]
+        print(f"{name:<18} {entry['requests']:>9} {entry['throughput_rps']:>9.1f} {latency.get('p50', 0):>9.2f} "
+              f"{latency.get('p90', 0):>9.2f} {latency.get('p99', 0):>9.2f} {entry['error_rate']:>8.2%} "
+              f"{entry['locked_rate']:>8.2%}")
+    lag = report["loop_lag_ms"]
+    print(f"event loop lag: p50 {lag.get('p50', 0):.2f} ms, p99 {lag.get('p99', 0):.2f} ms, "
+          f"max {lag.get('max', 0):.2f} ms")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running server; the app runs in-process when omitted")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=32, help="Workers, or the in-flight cap in an open loop")
+    parser.add_argument("--rate", type=float, default=0.0, help="Open-loop arrivals per second, 0 for a closed loop")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Operation weights, default {DEFAULT_MIX}")
+    parser.add_argument("--seed-teams", type=int, default=5)
+    parser.add_argument("--seed-employees", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=time.time_ns() % 10 ** 9, help="Random seed and row name prefix")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--keep-data", action="store_true", help="Leave the rows the generator created")
+    parser.add_argument("--log-level", default="WARNING", help="Level of the in-process app's request logging")
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("app_logger").setLevel(args.log_level.upper())
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Requests per second through the request middleware on a trivial endpoint.
+
+    python -m benchmarks.middleware [--requests 20000] [--concurrency 1] [--repeat 3] [--log-level WARNING]
+
+Calls each app over ASGI directly, without a server or an HTTP client, so the numbers are the app's own cost:
+no middleware, an empty ``BaseHTTPMiddleware`` dispatch (the plumbing ``log_requests`` used to pay for) and
+``RequestLoggingMiddleware``, which does all of the logging and metrics work.
+The request lines are filtered out by level by default; pass ``--log-level INFO`` to include enqueuing them.
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware import RequestLoggingMiddleware
+
+
+async def call_next_dispatch(request, call_next):
+    return await call_next(request)
+
+
+def build_app(middleware_class=None, **options) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    if middleware_class is not None:
+        app.add_middleware(middleware_class, **options)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def run(app, requests: int, concurrency: int) -> float:
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"", "headers": [],
+             "client": ("127.0.0.1", 50000), "server": ("testserver", 80)}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def worker(count: int):
+        for _ in range(count):
+            await app(dict(scope), receive, send)
+
+    await app(dict(scope), receive, send)  # Builds the middleware stack
+    started_at = time.perf_counter()
+    share, extra = divmod(requests, concurrency)
+    await asyncio.gather(*(worker(share + (i < extra)) for i in range(concurrency)))
+    return requests / (time.perf_counter() - started_at)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("app_logger").setLevel(args.log_level.upper())
+    cases = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware (call_next only)": build_app(BaseHTTPMiddleware, dispatch=call_next_dispatch),
+        "RequestLoggingMiddleware": build_app(RequestLoggingMiddleware),
+    }
+    for name, app in cases.items():
+        rate = max(asyncio.run(run(app, args.requests, args.concurrency)) for _ in range(args.repeat))
+        print(f"{name:<36} {rate:9.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Latency and throughput of the repository layer and the employee/team services against seeded SQLite databases.
+
+    python -m benchmarks.repository [--sizes 1000,100000,1000000] [--iterations 200] [--output FILE]
+
+Each dataset is a database file in ``--data-dir`` holding that many employees spread over ``size // 100`` teams,
+seeded once and reused while its row count still matches. Every call gets its own session, as a request does;
+setup such as loading the row to update runs outside the timed region. Full-table reads run
+``max(3, iterations * 1000 // size)`` times. Results (ops/sec, p50/p99 in ms) are written as JSON to ``--output``.
+"""
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import sqlalchemy
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.constants import DEFAULT_PAGE_SIZE
+from app.core.cache import repository_cache
+from app.core.pagination import encode_cursor
+from app.database import SQLITE_PRAGMAS, apply_sqlite_pragmas, create_schema
+from app.employees import employee_util, services as employee_services
+from app.employees.models import Employee
+from app.employees.repository import employee_repo
+from app.employees.schemas import EmployeeCreateRequest, EmployeeUpdateRequest
+from app.teams import services as team_services
+from app.teams.models import Team
+
+BENCHMARK_DIR = Path(__file__).parent
+SEED_BATCH_SIZE = 50_000
+
+
+def team_count(size: int) -> int:
+    return max(10, size // 100)
+
+
+def open_dataset(path: Path, size: int) -> sessionmaker:
+    """Return a session factory for the dataset at ``path``, seeding it first unless it already has ``size`` rows."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, SQLITE_PRAGMAS))
+    if path.exists():
+        with engine.connect() as connection:
+            try:
+                seeded = connection.scalar(select(func.count()).select_from(Employee))
+            except OperationalError:
+                seeded = None
+        if seeded == size:
+            return sessionmaker(bind=engine, autoflush=False)
+        engine.dispose()
+        path.unlink()
+
+    print(f"Seeding {size} employees into {path}", flush=True)
+    create_schema(engine)
+    teams = team_count(size)
+    with engine.begin() as connection:
+        connection.execute(insert(Team), [{"team_id": i, "team_name": f"TEAM{i:07d}"} for i in range(1, teams + 1)])
+        for start in range(1, size + 1, SEED_BATCH_SIZE):
+            connection.execute(insert(Employee), [
+                {"employee_id": i, "gpn": f"GPN{i:09d}", "employee_name": f"Employee {i}", "team_id": i % teams + 1}
+                for i in range(start, min(start + SEED_BATCH_SIZE, size + 1))
+            ])
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def percentile(latencies: list[float], share: float) -> float:
+    """Nearest-rank percentile of sorted ``latencies``."""
+    return latencies[max(0, round(share * len(latencies)) - 1)]
+
+
+def measure(name: str, size: int, iterations: int, session_factory: sessionmaker,
+            call: Callable[[Any, Session], Any], setup: Callable[[int, Session], Any] = lambda i, db: i) -> dict:
+    latencies = []
+    for i in range(iterations):
+        with session_factory() as db:
+            argument = setup(i, db)
+            started_at = time.perf_counter()
+            call(argument, db)
+            latencies.append(time.perf_counter() - started_at)
+    latencies.sort()
+    result = {
+        "case": name,
+        "rows": size,
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / sum(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+    print(f"{size:>9} {name:<44} {result['ops_per_sec']:>10.1f} ops/s  "
+          f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms", flush=True)
+    return result
+
+
+def run_dataset(size: int, iterations: int, session_factory: sessionmaker) -> list[dict]:
+    randomizer = random.Random(size)
+    gpns = [f"GPN{randomizer.randint(1, size):09d}" for _ in range(iterations)]
+    team_ids = [randomizer.randint(1, team_count(size)) for _ in range(iterations)]
+    cursors = [encode_cursor(randomizer.randint(1, size)) for _ in range(iterations)]
+    scan_iterations = max(3, iterations * 1000 // size)
+    run_id = time.time_ns() % 10 ** 8
+
+    def cold(key: Callable[[int], Any]) -> Callable[[int, Session], Any]:
+        def setup(i: int, db: Session) -> Any:
+            repository_cache.clear()
+            return key(i)
+        return setup
+
+    def repo_gpn(i: int) -> str:
+        return f"R{run_id:08d}{i:05d}"
+
+    def service_gpn(i: int) -> str:
+        return f"S{run_id:08d}{i:05d}"
+
+    def load_employee(gpn: Callable[[int], str]) -> Callable[[int, Session], Employee]:
+        return lambda i, db: employee_repo.get_by_field("gpn", gpn(i), db)
+
+    def renamed_employee(i: int, db: Session) -> Employee:
+        employee = load_employee(repo_gpn)(i, db)
+        employee.employee_name = f"Renamed {i}"
+        return employee
+
+    new_team_ids = []
+
+    def create_team(i: int, db: Session) -> None:
+        new_team_ids.append(team_services.create_team(f"T{run_id:08d}{i:05d}", db).team_id)
+
+    def case(name: str, call: Callable[[Any, Session], Any], setup: Callable[[int, Session], Any] = lambda i, db: i,
+             count: int = iterations) -> dict:
+        return measure(name, size, count, session_factory, call, setup)
+
+    return [
+        case("repository.create",
+             lambda i, db: employee_repo.create(Employee(gpn=repo_gpn(i), employee_name=f"Bench {i}"), db)),
+        case("repository.get_all", lambda i, db: employee_repo.get_all(db), count=scan_iterations),
+        case("repository.get_by_field", lambda gpn, db: employee_repo.get_by_field("gpn", gpn, db),
+             cold(gpns.__getitem__)),
+        case("repository.get_by_field (cached)", lambda gpn, db: employee_repo.get_by_field("gpn", gpn, db),
+             lambda i, db: gpns[0]),
+        case("repository.update", lambda employee, db: employee_repo.update(employee, db), renamed_employee),
+        case("repository.delete", lambda employee, db: employee_repo.delete(employee, db), load_employee(repo_gpn)),
+        case("employee_util.ensure_gpn_is_unique", lambda gpn, db: employee_util.ensure_gpn_is_unique(gpn, db),
+             cold(repo_gpn)),
+        case("employee_services.create_employee", lambda request, db: employee_services.create_employee(request, db),
+             lambda i, db: EmployeeCreateRequest(gpn=service_gpn(i), employee_name="Bench Employee",
+                                                 team_id=team_ids[i])),
+        case("employee_services.get_employee_by_gpn",
+             lambda gpn, db: employee_services.get_employee_by_gpn(gpn, db), cold(gpns.__getitem__)),
+        case("employee_services.get_employees_json",
+             lambda cursor, db: employee_services.get_employees_json(cursor, DEFAULT_PAGE_SIZE, db),
+             lambda i, db: cursors[i]),
+        case("employee_services.get_team_employees_json",
+             lambda team_id, db: employee_services.get_team_employees_json(team_id, None, DEFAULT_PAGE_SIZE, db),
+             lambda i, db: team_ids[i]),
+        case("employee_services.update_employee",
+             lambda i, db: employee_services.update_employee(
+                 service_gpn(i), EmployeeUpdateRequest(gpn=service_gpn(i), employee_name="Renamed Employee"), db),
+             cold(lambda i: i)),
+        case("employee_services.delete_employee", lambda i, db: employee_services.delete_employee(service_gpn(i), db),
+             cold(lambda i: i)),
+        case("team_services.create_team", create_team),
+        case("team_services.get_team", lambda team_id, db: team_services.get_team(team_id, db),
+             cold(team_ids.__getitem__)),
+        case("team_services.get_teams_json", lambda i, db: team_services.get_teams_json(None, None, db),
+             count=scan_iterations),
+        case("team_services.update_team",
+             lambda i, db: team_services.update_team(new_team_ids[i], f"U{run_id:08d}{i:05d}", db), cold(lambda i: i)),
+        case("team_services.delete_team", lambda i, db: team_services.delete_team(new_team_ids[i], db),
+             cold(lambda i: i)),
+    ]
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BENCHMARK_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="Comma-separated employee counts, one dataset each")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--data-dir", type=Path, default=BENCHMARK_DIR / "data")
+    parser.add_argument("--output", type=Path, default=BENCHMARK_DIR / "results" / "repository.json")
+    args = parser.parse_args(argv)
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for size in (int(size) for size in args.sizes.split(",")):
+        session_factory = open_dataset(args.data_dir / f"employees-{size}.db", size)
+        results.extend(run_dataset(size, args.iterations, session_factory))
+        session_factory.kw["bind"].dispose()
+
+    report = {
+        "benchmark": "repository",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-item cost of encoding a GET /employees body.
+
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+
+Compares FastAPI's ``response_model`` path (validation, then ``JSONResponse`` or ``ORJSONResponse``), a cached
+``TypeAdapter`` validating then calling ``dump_json``, and ``dump_rows``, which skips validation for trusted rows.
+"""
+import argparse
+import asyncio
+import timeit
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+from app.core.serialization import dump_rows
+from app.employees.models import Employee
+from app.employees.schemas import EmployeeResponse
+from app.teams.models import Team  # noqa: F401 - registers the Employee.team relationship target
+
+
+def make_rows(count: int) -> list[Employee]:
+    return [Employee(employee_id=i, gpn=f"GPN{i:07d}", employee_name=f"Employee {i}", team_id=i % 50 or None)
+            for i in range(1, count + 1)]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    field = create_model_field(name="Response", type_=list[EmployeeResponse], mode="serialization")
+    adapter = TypeAdapter(list[EmployeeResponse])
+
+    def response_model(response_class):
+        content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=True))
+        return response_class(content).body
+
+    def type_adapter():
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    cases = {
+        "response_model + JSONResponse": lambda: response_model(JSONResponse),
+        "response_model + ORJSONResponse": lambda: response_model(ORJSONResponse),
+        "TypeAdapter validate + dump_json": type_adapter,
+        "dump_rows (no validation)": lambda: dump_rows(EmployeeResponse, rows),
+    }
+    baseline = None
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        per_item = seconds / args.rows * 1e6
+        baseline = baseline or per_item
+        print(f"{name:<36} {per_item:7.2f} us/item  {baseline / per_item:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import OperationalError
+
 from app.employees import controller as employee_controller 
 from app.teams import controller as team_controller
-from app.database import engine, Base
-from app.middleware import log_requests
+from app.monitoring import controller as monitoring_controller
+from app.database import create_schema
+from app.exceptions import DatabaseLockedException
+from app.middleware import RequestLoggingMiddleware
 
-Base.metadata.create_all(bind=engine)
+create_schema()
 
-app = FastAPI()
-app.middleware("http")(log_requests)
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(RequestLoggingMiddleware)
 app.include_router(employee_controller.router)
-app.include_router(team_controller.router)
\ No newline at end of file
+app.include_router(team_controller.router)
+app.include_router(monitoring_controller.router)
+
+
+@app.exception_handler(OperationalError)
+async def database_locked_handler(request: Request, exc: OperationalError):
+    # Only lock timeouts are the caller's to retry; any other operational error stays a 500
+    if "database is locked" not in str(exc.orig):
+        raise exc
+    return await http_exception_handler(request, DatabaseLockedException())
@@ -6,14 +6,18 @@ from dotenv import load_dotenv
 from pathlib import Path
 
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 from unittest.mock import MagicMock
 
-from app.database import Base
-from app.dependencies import get_db
+from app.core.cache import repository_cache
+from app.core.response_cache import response_cache
+from app.database import instrument_engine
+from app.dependencies import get_db, get_read_db
 from app.loggers import logger
+from tests.isolation import (build_template, clone_database, configure_test_engine, rolled_back, savepoint_sessions,
+                             seed_employees)
 
 from main import app
 
@@ -21,40 +25,39 @@ load_dotenv()
 
 # Configuration based on environment variable
 USE_PERSISTENT_TEST_DB = os.getenv("USE_PERSISTENT_TEST_DB", "false").lower() == "true"
-db_path = Path(__file__).parent.parent / "db" / "test.db"
+# Set by pytest-xdist (pytest -n auto); every worker gets a database of its own
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "main")
+db_path = Path(__file__).parent.parent / "db" / f"test-{WORKER_ID}.db"
 db_path.parent.mkdir(parents=True, exist_ok=True)
 TEST_DATABASE_PATH = db_path.resolve()
 TEST_DATABASE_URL = f"sqlite:///{TEST_DATABASE_PATH}"
 
 
-@pytest.fixture(scope="module")
-def test_engine():
-    """Create test database engine - in-memory by default, file-based if specified"""
+@pytest.fixture(scope="session")
+def template_dir(tmp_path_factory):
+    """Directory shared by every worker of the run, where the template databases are built once"""
+    base = tmp_path_factory.getbasetemp()
+    return base.parent if WORKER_ID != "main" else base
+
+
+@pytest.fixture(scope="session")
+def test_engine(template_dir):
+    """Test database engine - in-memory by default, file-based if specified - cloned from the schema template"""
     if USE_PERSISTENT_TEST_DB:
-        engine = create_engine(
-            TEST_DATABASE_URL,
-            connect_args={"check_same_thread": False}
-        )
+        engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
     else:
-        # Use in-memory database for testing
         engine = create_engine(
             "sqlite:///:memory:",
             connect_args={"check_same_thread": False},
             poolclass=StaticPool,  # Keeps the in-memory db alive
         )
-
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-
-    Base.metadata.create_all(bind=engine)
+    configure_test_engine(engine)
+    clone_database(build_template(template_dir / "schema.db"), engine)
+    instrument_engine(engine)
 
     yield engine
 
-    # Clean up database
-    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
     if USE_PERSISTENT_TEST_DB and Path(TEST_DATABASE_PATH).exists():
         try:
             Path(TEST_DATABASE_PATH).unlink()
@@ -62,19 +65,70 @@ def test_engine():
             logger.warn(f"Warning: Could not delete test DB file - {e}")
 
 
+@pytest.fixture(scope="session")
+def seeded_engine(template_dir):
+    """In-memory database cloned from a template pre-seeded by ``tests.isolation.seed_employees``"""
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    configure_test_engine(engine)
+    clone_database(build_template(template_dir / "seeded.db", seed_employees), engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Every test rolls its rows back, so rows cached by an earlier test must not leak into the next"""
+    for cache in (repository_cache, response_cache):
+        if cache is not None:
+            cache.clear()
+
+
 @pytest.fixture(scope="function")
-def test_db(test_engine):
-    """Create a database session for each test with automatic rollback"""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-    session = TestingSessionLocal()
+def test_connection(test_engine):
+    """Connection whose transaction, and every commit made inside it, is rolled back after the test"""
+    with rolled_back(test_engine) as connection:
+        yield connection
+
 
+@pytest.fixture(scope="function")
+def test_db(test_connection):
+    """Create a database session for each test with automatic rollback, repository commits included"""
+    session = savepoint_sessions(test_connection)()
     try:
         yield session
     finally:
-        session.rollback()  # Rollback any changes
         session.close()
 
 
+@pytest.fixture(scope="function")
+def seeded_db(seeded_engine):
+    """Session on the pre-seeded database, rolled back like ``test_db``"""
+    with rolled_back(seeded_engine) as connection:
+        session = savepoint_sessions(connection)()
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+@pytest.fixture
+def statements(test_engine):
+    """SQL statements sent to the test database while the test runs"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(test_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 @pytest.fixture(scope="function")
 def client(test_db):
     """Create test client with database dependency override"""
@@ -86,6 +140,7 @@ def client(test_db):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     try:
         with TestClient(app) as test_client:
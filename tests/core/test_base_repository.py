@@ -4,6 +4,7 @@ from sqlalchemy import Column, Integer, String
 from sqlalchemy.exc import IntegrityError, InvalidRequestError
 
 from app.core.base_repository import BaseRepository
+from app.core.cache import LRUCache
 from app.database import Base
 
 
@@ -118,3 +119,215 @@ def test_get_by_field_invalid_field(repo, test_db):
         repo.get_by_field("invalid_field", 1000, test_db)
 
     assert "FakeModel has no field 'invalid_field'" in str(exc_info.value)
+
+
+def test_get_page(repo, test_db):
+    created = [repo.create(FakeModel(name=f"Paged Person {i}"), test_db) for i in range(5)]
+    keys = [item.fake_id for item in created]
+
+    first_page = repo.get_page(None, 2, test_db)
+    next_page = repo.get_page(keys[1], 2, test_db)
+
+    assert first_page == repo.get_all(test_db)[:2]
+    assert [item.fake_id for item in next_page] == keys[2:4]
+    assert repo.get_page(keys[-1], 2, test_db) == []
+
+
+def test_bulk_insert(repo, test_db):
+    keys = repo.bulk_insert([{"name": "Bulk Person 1"}, {"name": "Bulk Person 2"}], test_db)
+
+    assert len(keys) == 2
+    assert [repo.get_by_field("fake_id", key, test_db).name for key in keys] == ["Bulk Person 1", "Bulk Person 2"]
+
+
+def test_bulk_insert_empty(repo, test_db):
+    assert repo.bulk_insert([], test_db) == []
+
+
+def test_bulk_insert_duplicate_rolls_back_batch(repo, test_db):
+    with pytest.raises(IntegrityError):
+        repo.bulk_insert([{"name": "Bulk Person 3"}, {"name": "Bulk Person 3"}], test_db)
+
+    assert repo.get_by_field("name", "Bulk Person 3", test_db) is None
+
+
+def test_get_existing_values(repo, test_db):
+    repo.create(FakeModel(name="Existing Person 1"), test_db)
+    repo.create(FakeModel(name="Existing Person 2"), test_db)
+
+    existing = repo.get_existing_values("name", ["Existing Person 1", "Existing Person 2", "Missing Person"], test_db)
+
+    assert existing == {"Existing Person 1", "Existing Person 2"}
+
+
+def test_upsert(repo, test_db):
+    existing = repo.create(FakeModel(name="Upsert Person 1"), test_db)
+
+    outcomes = repo.upsert(
+        [{"fake_id": existing.fake_id, "name": "Upsert Person 1"},
+         {"fake_id": existing.fake_id, "name": "Upsert Person 2"},
+         {"fake_id": 5000, "name": "Upsert Person 3"}],
+        "fake_id", test_db)
+
+    assert outcomes == ["unchanged", "updated", "inserted"]
+    test_db.expire_all()
+    assert repo.get_by_field("fake_id", existing.fake_id, test_db).name == "Upsert Person 2"
+    assert repo.get_by_field("fake_id", 5000, test_db).name == "Upsert Person 3"
+
+
+def test_upsert_constraint_violation_rolls_back(repo, test_db):
+    repo.create(FakeModel(name="Upsert Person 4"), test_db)
+
+    with pytest.raises(IntegrityError):
+        repo.upsert([{"fake_id": 6000, "name": "Upsert Person 5"}, {"fake_id": 6001, "name": "Upsert Person 4"}],
+                    "fake_id", test_db)
+
+    assert repo.get_by_field("fake_id", 6000, test_db) is None
+
+
+def test_delete_by_field_values(repo, test_db):
+    repo.create(FakeModel(name="Doomed Person 1"), test_db)
+    repo.create(FakeModel(name="Doomed Person 2"), test_db)
+
+    deleted = repo.delete_by_field_values("name", ["Doomed Person 1", "Doomed Person 2", "Missing Person"], test_db)
+
+    assert deleted == {"Doomed Person 1", "Doomed Person 2"}
+    assert repo.get_by_field("name", "Doomed Person 1", test_db) is None
+    assert repo.get_by_field("name", "Doomed Person 2", test_db) is None
+
+
+class NameTakenError(Exception):
+    pass
+
+
+@pytest.fixture
+def translating_repo():
+    return FakeRepository(FakeModel, "fake_id", unique_exceptions={"name": NameTakenError})
+
+
+def test_create_translates_unique_violation(translating_repo, test_db):
+    translating_repo.create(FakeModel(name="Unique Person 1"), test_db)
+    with pytest.raises(NameTakenError) as exc_info:
+        translating_repo.create(FakeModel(name="Unique Person 1"), test_db)
+    assert str(exc_info.value) == "Unique Person 1"
+
+
+def test_update_translates_unique_violation(translating_repo, test_db):
+    translating_repo.create(FakeModel(name="Unique Person 2"), test_db)
+    created_result = translating_repo.create(FakeModel(name="Unique Person 3"), test_db)
+    created_result.name = "Unique Person 2"
+    with pytest.raises(NameTakenError) as exc_info:
+        translating_repo.update(created_result, test_db)
+    assert str(exc_info.value) == "Unique Person 2"
+    assert translating_repo.get_by_field("fake_id", created_result.fake_id, test_db).name == "Unique Person 3"
+
+
+def test_create_keeps_other_integrity_errors(translating_repo, test_db):
+    with pytest.raises(IntegrityError) as exc_info:
+        translating_repo.create(FakeModel(name=None), test_db)
+    assert "NOT NULL constraint failed: fake_table.name" in str(exc_info.value)
+
+
+def test_insert_returning(repo, test_db, statements):
+    result = repo.insert_returning({"name": "Returning Person 1"}, test_db)
+
+    assert result.fake_id is not None
+    assert result.name == "Returning Person 1"
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
+    assert repo.get_by_field("fake_id", result.fake_id, test_db) is result
+
+
+def test_insert_returning_translates_unique_violation(translating_repo, test_db):
+    translating_repo.insert_returning({"name": "Returning Person 2"}, test_db)
+    with pytest.raises(NameTakenError):
+        translating_repo.insert_returning({"name": "Returning Person 2"}, test_db)
+
+
+def test_update_returning(repo, test_db, statements):
+    created_result = repo.insert_returning({"name": "Returning Person 3"}, test_db)
+    statements.clear()
+
+    result = repo.update_returning(created_result, {"name": "Returning Person 4"}, test_db)
+
+    assert result is created_result
+    assert result.name == "Returning Person 4"
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE") and "RETURNING" in statements[0]
+
+
+def test_update_returning_translates_unique_violation(translating_repo, test_db):
+    translating_repo.insert_returning({"name": "Returning Person 5"}, test_db)
+    created_result = translating_repo.insert_returning({"name": "Returning Person 6"}, test_db)
+    with pytest.raises(NameTakenError) as exc_info:
+        translating_repo.update_returning(created_result, {"name": "Returning Person 5"}, test_db)
+    assert str(exc_info.value) == "Returning Person 5"
+    assert created_result.name == "Returning Person 6"
+
+
+@pytest.fixture
+def cached_repo():
+    return FakeRepository(FakeModel, "fake_id", cache=LRUCache(16))
+
+
+def test_get_by_field_cached(cached_repo, test_db, statements):
+    created_result = cached_repo.insert_returning({"name": "Cached Person 1"}, test_db)
+    test_db.expunge_all()
+    cached_repo.get_by_field("name", "Cached Person 1", test_db)
+    test_db.expunge_all()
+    statements.clear()
+
+    result = cached_repo.get_by_field("name", "Cached Person 1", test_db)
+
+    assert statements == []
+    assert result.fake_id == created_result.fake_id
+    assert result in test_db
+    assert cached_repo.cache.stats()["hits"] == 1
+
+
+def test_get_by_field_missing_is_not_cached(cached_repo, test_db):
+    assert cached_repo.get_by_field("name", "Cached Person 2", test_db) is None
+    cached_repo.insert_returning({"name": "Cached Person 2"}, test_db)
+    assert cached_repo.get_by_field("name", "Cached Person 2", test_db).name == "Cached Person 2"
+
+
+def test_update_returning_evicts_old_and_new_keys(cached_repo, test_db):
+    created_result = cached_repo.insert_returning({"name": "Cached Person 3"}, test_db)
+    cached_repo.get_by_field("name", "Cached Person 3", test_db)
+    cached_repo.get_by_field("fake_id", created_result.fake_id, test_db)
+
+    cached_repo.update_returning(created_result, {"name": "Cached Person 4"}, test_db)
+    test_db.expunge_all()
+
+    assert cached_repo.get_by_field("name", "Cached Person 3", test_db) is None
+    assert cached_repo.get_by_field("fake_id", created_result.fake_id, test_db).name == "Cached Person 4"
+    assert cached_repo.cache.stats()["hits"] == 0
+
+
+def test_update_evicts_table(cached_repo, test_db):
+    created_result = cached_repo.create(FakeModel(name="Cached Person 5"), test_db)
+    cached_repo.get_by_field("name", "Cached Person 5", test_db)
+
+    created_result.name = "Cached Person 6"
+    cached_repo.update(created_result, test_db)
+
+    assert cached_repo.get_by_field("name", "Cached Person 5", test_db) is None
+
+
+def test_delete_evicts(cached_repo, test_db):
+    created_result = cached_repo.create(FakeModel(name="Cached Person 7"), test_db)
+    cached_repo.get_by_field("name", "Cached Person 7", test_db)
+
+    cached_repo.delete(created_result, test_db)
+
+    assert cached_repo.get_by_field("name", "Cached Person 7", test_db) is None
+
+
+def test_delete_by_field_values_evicts(cached_repo, test_db):
+    fake_id = cached_repo.create(FakeModel(name="Cached Person 8"), test_db).fake_id
+    cached_repo.get_by_field("fake_id", fake_id, test_db)
+
+    cached_repo.delete_by_field_values("name", ["Cached Person 8"], test_db)
+
+    assert cached_repo.get_by_field("fake_id", fake_id, test_db) is None
+
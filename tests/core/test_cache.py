@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from app.core.cache import LRUCache, build_repository_cache
+
+
+def test_get_missing_counts_miss():
+    cache = LRUCache(2)
+    assert cache.get(("t", "id", 1)) is None
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1, "evictions": 0}
+
+
+def test_set_and_get_counts_hit():
+    cache = LRUCache(2)
+    cache.set(("t", "id", 1), {"id": 1}, cache.generation("t"))
+    assert cache.get(("t", "id", 1)) == {"id": 1}
+    assert cache.stats()["hits"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    for value in (1, 2):
+        cache.set(("t", "id", value), value, cache.generation("t"))
+    cache.get(("t", "id", 1))
+    cache.set(("t", "id", 3), 3, cache.generation("t"))
+
+    assert cache.get(("t", "id", 2)) is None
+    assert cache.get(("t", "id", 1)) == 1
+    assert cache.get(("t", "id", 3)) == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss():
+    cache = LRUCache(2, ttl=10)
+    with patch("app.core.cache.time.monotonic", return_value=100.0):
+        cache.set(("t", "id", 1), 1, cache.generation("t"))
+    with patch("app.core.cache.time.monotonic", return_value=110.0):
+        assert cache.get(("t", "id", 1)) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_set_with_stale_generation_is_dropped():
+    cache = LRUCache(2)
+    generation = cache.generation("t")
+    cache.delete(("t", "id", 1))
+    cache.set(("t", "id", 1), "stale", generation)
+    assert cache.get(("t", "id", 1)) is None
+
+
+def test_delete_table_only_drops_that_table():
+    cache = LRUCache(4)
+    cache.set(("a", "id", 1), 1, cache.generation("a"))
+    cache.set(("b", "id", 1), 1, cache.generation("b"))
+    cache.delete_table("a")
+    assert cache.get(("a", "id", 1)) is None
+    assert cache.get(("b", "id", 1)) == 1
+
+
+def test_build_repository_cache_disabled(monkeypatch):
+    monkeypatch.setenv("REPOSITORY_CACHE_SIZE", "0")
+    assert build_repository_cache() is None
+
+
+def test_build_repository_cache_from_env(monkeypatch):
+    monkeypatch.setenv("REPOSITORY_CACHE_SIZE", "16")
+    monkeypatch.setenv("REPOSITORY_CACHE_TTL", "0")
+    cache = build_repository_cache()
+    assert cache.max_size == 16
+    assert cache.ttl is None
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.db_executor import DatabaseExecutor
+from app.core.metrics import metrics_registry
+from app.exceptions import DatabaseBusyException
+
+
+@pytest.fixture
+def executor():
+    executor = DatabaseExecutor(max_workers=1, max_queue=0, name="test")
+    yield executor
+    executor.shutdown()
+
+
+def sample(name: str) -> float:
+    prefix = f'{name}{{executor="test"}} '
+    body = metrics_registry.render()
+    return next((float(line.removeprefix(prefix)) for line in body.splitlines() if line.startswith(prefix)), 0)
+
+
+@pytest.mark.anyio
+async def test_run_returns_result_and_records_stats(executor):
+    waits, runs = sample("db_executor_wait_seconds_count"), sample("db_executor_run_seconds_count")
+
+    result = await executor.run(lambda a, b: a + b, 1, 2)
+
+    stats = executor.stats.snapshot()
+    assert result == 3
+    assert stats["calls"] == 1
+    assert stats["rejected"] == 0
+    assert stats["total_wait"] >= 0
+    assert stats["total_run"] >= 0
+    assert sample("db_executor_wait_seconds_count") == waits + 1
+    assert sample("db_executor_run_seconds_count") == runs + 1
+
+
+@pytest.mark.anyio
+async def test_run_runs_off_the_event_loop_thread(executor):
+    thread_name = await executor.run(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("db-executor")
+
+
+@pytest.mark.anyio
+async def test_run_propagates_exceptions_and_frees_slot(executor):
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await executor.run(fail)
+
+    assert await executor.run(lambda: "ok") == "ok"
+    assert executor.stats.snapshot()["calls"] == 2
+
+
+@pytest.mark.anyio
+async def test_run_rejects_when_saturated(executor):
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(timeout=5)
+        return "done"
+
+    rejections = sample("db_executor_rejections_total")
+    blocked_call = asyncio.create_task(executor.run(block))
+    await asyncio.to_thread(started.wait, 5)
+
+    with pytest.raises(DatabaseBusyException) as exc_info:
+        await executor.run(lambda: None)
+
+    release.set()
+    assert await blocked_call == "done"
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert executor.stats.snapshot()["rejected"] == 1
+    assert sample("db_executor_rejections_total") == rejections + 1
@@ -0,0 +1,49 @@
+from app.core.importer import ChunkResult, ImportRecord, iter_records, run_import
+
+
+def test_iter_records_csv():
+    lines = ["gpn,employee_name,team_name\n", "GPN1,Alice,TEAM_A\n", "GPN2,Bob,\n", "GPN3,Carol,TEAM_A,extra\n"]
+
+    records = list(iter_records(lines, "csv"))
+
+    assert records == [
+        ImportRecord(1, {"gpn": "GPN1", "employee_name": "Alice", "team_name": "TEAM_A"}),
+        ImportRecord(2, {"gpn": "GPN2", "employee_name": "Bob", "team_name": None}),
+        ImportRecord(3, None, "Row has more columns than the header"),
+    ]
+
+
+def test_iter_records_ndjson():
+    lines = ['{"team_name": "TEAM_A"}\n', "\n", "not json\n", "[1, 2]\n"]
+
+    records = list(iter_records(lines, "ndjson"))
+
+    assert records[0] == ImportRecord(1, {"team_name": "TEAM_A"})
+    assert records[1].row == 2 and records[1].error.startswith("Invalid JSON")
+    assert records[2] == ImportRecord(3, None, "Expected a JSON object")
+
+
+def test_run_import_reports_per_chunk():
+    records = [ImportRecord(row, {"value": row}) for row in range(1, 6)]
+    chunks = []
+
+    def import_chunk(chunk):
+        chunks.append([record.row for record in chunk])
+        rejected = [record._replace(error="bad row") for record in chunk if record.row == 4]
+        return ChunkResult(len(chunk) - len(rejected), rejected)
+
+    events = list(run_import(records, 2, import_chunk))
+
+    assert chunks == [[1, 2], [3, 4], [5]]
+    assert [event["event"] for event in events] == ["progress", "progress", "rejected", "progress", "summary"]
+    assert events[2] == {"event": "rejected", "row": 4, "error": "bad row"}
+    assert events[-1]["rows"] == 5
+    assert events[-1]["accepted"] == 4
+    assert events[-1]["rejected"] == 1
+
+
+def test_run_import_without_records():
+    events = list(run_import([], 2, lambda chunk: ChunkResult(0, [])))
+
+    assert [event["event"] for event in events] == ["summary"]
+    assert events[0]["rows"] == 0
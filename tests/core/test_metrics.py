@@ -0,0 +1,62 @@
+import threading
+
+from app.core.metrics import CallbackMetric, Counter, Gauge, Histogram, MetricsRegistry
+
+
+def render(metric) -> list[str]:
+    registry = MetricsRegistry()
+    registry.register(metric)
+    return registry.render().splitlines()
+
+
+def test_counter_sums_threads():
+    counter = Counter("jobs_total", "Jobs.", ("queue",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("default",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert render(counter) == [
+        "# HELP jobs_total Jobs.",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="default"} 4000',
+    ]
+
+
+def test_gauge_goes_down():
+    gauge = Gauge("in_flight", "In flight.")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert render(gauge)[-1] == "in_flight 1"
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(("/a",), value)
+
+    assert render(histogram)[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("paths_total", "Paths.", ("path",))
+    counter.inc(('say "hi"\\\n',))
+    assert render(counter)[-1] == 'paths_total{path="say \\"hi\\"\\\\\\n"} 1'
+
+
+def test_callback_metric():
+    metric = CallbackMetric("hits_total", "Hits.", ("cache",), lambda: {("rows",): 3}, "counter")
+    assert render(metric)[1:] == ["# TYPE hits_total counter", 'hits_total{cache="rows"} 3']
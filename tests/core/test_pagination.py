@@ -0,0 +1,39 @@
+import pytest
+
+from app.core.pagination import encode_cursor, decode_cursor, build_page
+from app.exceptions import InvalidCursorException
+
+
+class Row:
+    def __init__(self, row_id):
+        self.row_id = row_id
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_decode_cursor_none():
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor("abc"), "eyJ4IjogMX0"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_build_page_with_more_rows():
+    page = build_page([Row(1), Row(2), Row(3)], 2, "row_id")
+
+    assert [row.row_id for row in page.items] == [1, 2]
+    assert decode_cursor(page.next_cursor) == 2
+
+
+def test_build_page_last_page():
+    page = build_page([Row(1), Row(2)], 2, "row_id")
+
+    assert len(page.items) == 2
+    assert page.next_cursor is None
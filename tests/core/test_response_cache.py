@@ -0,0 +1,46 @@
+import gzip
+
+from starlette.requests import Request
+
+from app.constants import GZIP_MIN_SIZE
+from app.core.response_cache import accepts_gzip, encode_body, to_response
+
+
+def make_request(accept_encoding: str | None = None) -> Request:
+    headers = [] if accept_encoding is None else [(b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+def test_encode_body_skips_small_bodies():
+    assert encode_body(b"[]").gzipped is None
+
+
+def test_encode_body_compresses_large_bodies():
+    body = b"[" + b"1," * GZIP_MIN_SIZE + b"1]"
+    entry = encode_body(body, "cursor")
+    assert gzip.decompress(entry.gzipped) == body
+    assert entry.next_cursor == "cursor"
+
+
+def test_accepts_gzip():
+    assert accepts_gzip(make_request("gzip, deflate"))
+    assert accepts_gzip(make_request("br;q=1.0, GZIP;q=0.5"))
+    assert not accepts_gzip(make_request("gzip;q=0"))
+    assert not accepts_gzip(make_request("deflate"))
+    assert not accepts_gzip(make_request())
+
+
+def test_to_response_picks_encoding():
+    body = b"[" + b"1," * GZIP_MIN_SIZE + b"1]"
+    entry = encode_body(body, "cursor")
+
+    plain = to_response(entry, make_request(), 'W/"v"')
+    assert plain.body == body
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["ETag"] == 'W/"v"'
+    assert plain.headers["X-Next-Cursor"] == "cursor"
+
+    compressed = to_response(entry, make_request("gzip"), 'W/"v"')
+    assert compressed.body == entry.gzipped
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
@@ -0,0 +1,38 @@
+import json
+
+from pydantic import BaseModel
+
+from app.core.serialization import dump_ndjson, dump_rows
+
+
+class ItemResponse(BaseModel):
+    item_id: int
+    name: str
+    parent_id: int | None = None
+
+
+class Row:
+    def __init__(self, item_id, name, parent_id=None, secret="hidden"):
+        self.item_id = item_id
+        self.name = name
+        self.parent_id = parent_id
+        self.secret = secret
+
+
+def test_dump_rows_matches_response_model():
+    rows = [Row(1, "First"), Row(2, "Second", 1)]
+    expected = [ItemResponse.model_validate(row, from_attributes=True).model_dump() for row in rows]
+    assert json.loads(dump_rows(ItemResponse, rows)) == expected
+
+
+def test_dump_rows_empty():
+    assert dump_rows(ItemResponse, []) == b"[]"
+
+
+def test_dump_ndjson():
+    body = dump_ndjson(ItemResponse, [Row(1, "First"), Row(2, "Second", 1)])
+    assert body.endswith(b"\n")
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {"item_id": 1, "name": "First", "parent_id": None},
+        {"item_id": 2, "name": "Second", "parent_id": 1},
+    ]
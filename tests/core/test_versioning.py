@@ -0,0 +1,45 @@
+from app.core.versioning import VersionRegistry, etag_matches, make_etag
+
+
+def test_table_version_starts_at_epoch():
+    versions = VersionRegistry()
+    assert versions.table_version("t") == f"{versions.epoch}-0"
+
+
+def test_epoch_differs_between_registries():
+    assert VersionRegistry().epoch != VersionRegistry().epoch
+
+
+def test_bump_rows():
+    versions = VersionRegistry()
+    other_row = versions.row_version("t", 2)
+
+    versions.bump("t", [1])
+
+    assert versions.table_version("t") == f"{versions.epoch}-1"
+    assert versions.row_version("t", 1) == f"{versions.epoch}-0-1"
+    assert versions.row_version("t", "1") == versions.row_version("t", 1)
+    assert versions.row_version("t", 2) == other_row
+
+
+def test_bump_table_changes_every_row():
+    versions = VersionRegistry()
+    versions.bump("t", [1])
+    rows = versions.row_version("t", 1), versions.row_version("t", 2)
+
+    versions.bump("t")
+
+    assert versions.row_version("t", 1) not in rows
+    assert versions.row_version("t", 2) not in rows
+    assert versions.table_version("other") == f"{versions.epoch}-0"
+
+
+def test_etag_matches():
+    etag = make_etag("abc-1")
+    assert etag == 'W/"abc-1"'
+    assert etag_matches('W/"abc-1"', etag)
+    assert etag_matches('"abc-1"', etag)
+    assert etag_matches('W/"abc-0", W/"abc-1"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"abc-2"', etag)
+    assert not etag_matches(None, etag)
@@ -1,5 +1,5 @@
+import json
 import pytest
-from sqlalchemy.exc import IntegrityError
 from unittest.mock import patch
 
 from app.employees.models import Employee
@@ -71,10 +71,11 @@ def test_create_employee_when_gpn_already_exists(client):
 
 @pytest.mark.real_db
 def test_create_employee_when_team_does_not_exist(client):
-    with pytest.raises(IntegrityError) as exc_info:
-        client.post("/employees/", json={"gpn": "GPN_CEC3", "employee_name": "John Doe", "team_id": 100000})
+    response = client.post("/employees/", json={"gpn": "GPN_CEC3", "employee_name": "John Doe", "team_id": 100000})
 
-    assert "FOREIGN KEY constraint failed" in str(exc_info.value)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Team with ID 100000 not found"
+    assert client.get("/employees/GPN_CEC3").status_code == 404
 
 
 @pytest.mark.real_db
@@ -123,9 +124,12 @@ def test_update_employee_when_team_does_not_exist(client):
     team_name = "TEAM_UEC2"
     team = client.post("/teams/", json={"team_name": team_name}).json()
     client.post("/employees/", json={"gpn": "GPN_UEC2", "employee_name": "Alice Smith", "team_id": team["team_id"]})
-    with pytest.raises(IntegrityError) as exc_info:
-        client.put("/employees/GPN_UEC2", json={"gpn": "GPN_UEC2", "employee_name": "John Doe", "team_id": 1000000})
-    assert "FOREIGN KEY constraint failed" in str(exc_info.value)
+    response = client.put("/employees/GPN_UEC2", json={"gpn": "GPN_UEC2", "employee_name": "John Doe",
+                                                       "team_id": 1000000})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Team with ID 1000000 not found"
+    assert client.get("/employees/GPN_UEC2").json()["team_id"] == team["team_id"]
 
 
 @pytest.mark.real_db
@@ -205,7 +209,8 @@ def test_get_all_employees_returns_list_of_employees(client, fake_db):
     with patch("app.employees.repository.employee_repo.get_all", return_value=[Employee(gpn="GPN999", employee_name="John Doe", employee_id=1, team_id=1)]):
         response = client.get("/employees/")
         assert response.status_code == 200
-        assert response.json() == [{'employee_id': 1, 'employee_name': 'John Doe', 'gpn': 'GPN999', 'team_id': 1}]
+        assert response.json() == [{'employee_id': 1, 'employee_name': 'John Doe', 'gpn': 'GPN999', 'team_id': 1,
+                                    'team_name': None}]
 
 
 @pytest.mark.fake_db
@@ -213,7 +218,8 @@ def test_get_employee_by_gpn(client, fake_db):
     with patch("app.employees.repository.employee_repo.get_by_field", return_value=Employee(gpn="GPN999", employee_name="John Doe", employee_id=1, team_id=1)):
         response = client.get("/employees/GPN999")
         assert response.status_code == 200
-        assert response.json() == {'employee_id': 1, 'employee_name': 'John Doe', 'gpn': 'GPN999', 'team_id': 1}
+        assert response.json() == {'employee_id': 1, 'employee_name': 'John Doe', 'gpn': 'GPN999', 'team_id': 1,
+                                   'team_name': None}
 
 
 @pytest.mark.fake_db
@@ -221,3 +227,257 @@ def test_get_employee_by_gpn_invalid(client, fake_db):
     with patch("app.employees.repository.employee_repo.get_by_field", return_value=None):
         response = client.get("/employees/GPN_INVALID")
         assert response.status_code == 404
+
+
+@pytest.mark.real_db
+def test_get_employees_paginated(client):
+    created = [client.post("/employees/", json={"gpn": f"GPN_PEC{i}", "employee_name": "John Doe"}).json()
+               for i in range(5)]
+
+    seen = []
+    response = client.get("/employees/", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(employee["employee_id"] for employee in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get("/employees/", params={"limit": 2, "cursor": cursor})
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen))
+    assert all(employee["employee_id"] in seen for employee in created)
+
+
+@pytest.mark.real_db
+def test_get_employees_invalid_cursor(client):
+    response = client.get("/employees/", params={"cursor": "invalid"})
+    assert response.status_code == 400
+
+
+@pytest.mark.real_db
+def test_export_employees_streams_ndjson(client):
+    client.post("/employees/", json={"gpn": "GPN_EXC1", "employee_name": "John Doe"})
+    client.post("/employees/", json={"gpn": "GPN_EXC2", "employee_name": "Davis Smith"})
+
+    response = client.get("/employees/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == client.get("/employees/").json()
+    assert any(row["gpn"] == "GPN_EXC1" for row in rows)
+    assert any(row["gpn"] == "GPN_EXC2" for row in rows)
+
+
+@pytest.mark.real_db
+def test_bulk_create_employees(client):
+    client.post("/employees/", json={"gpn": "GPN_BEC1", "employee_name": "John Doe"})
+    response = client.post("/employees/bulk", json=[
+        {"gpn": "GPN_BEC1", "employee_name": "John Doe"},
+        {"gpn": "GPN_BEC2", "employee_name": "Davis Smith"},
+    ])
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+    assert response.json()["duplicates"] == 1
+    assert response.json()["results"][0] == {"gpn": "GPN_BEC1", "status": "duplicate", "employee_id": None}
+    assert response.json()["results"][1]["status"] == "created"
+    assert client.get("/employees/GPN_BEC2").json()["employee_id"] == response.json()["results"][1]["employee_id"]
+
+
+@pytest.mark.real_db
+def test_bulk_create_employees_with_unknown_team(client):
+    response = client.post("/employees/bulk", json=[
+        {"gpn": "GPN_BEC5", "employee_name": "John Doe", "team_id": 100000},
+        {"gpn": "GPN_BEC6", "employee_name": "Davis Smith"},
+    ])
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+    assert response.json()["team_not_found"] == 1
+    assert response.json()["results"][0] == {"gpn": "GPN_BEC5", "status": "team_not_found", "employee_id": None}
+    assert client.get("/employees/GPN_BEC5").status_code == 404
+    assert client.get("/employees/GPN_BEC6").status_code == 200
+
+
+@pytest.mark.real_db
+def test_bulk_create_employees_validates_every_row(client):
+    response = client.post("/employees/bulk", json=[
+        {"gpn": "GPN_BEC3", "employee_name": "John Doe"},
+        {"gpn": "GPN_BEC4"},
+    ])
+
+    assert response.status_code == 422
+    assert client.get("/employees/GPN_BEC3").status_code == 404
+
+
+@pytest.mark.real_db
+def test_bulk_create_employees_empty_list(client):
+    response = client.post("/employees/bulk", json=[])
+    assert response.status_code == 422
+
+
+@pytest.mark.real_db
+def test_upsert_single_employee(client):
+    response = client.put("/employees/upsert", json={"gpn": "GPN_USC1", "employee_name": "John Doe"})
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 1, "updated": 0, "unchanged": 0}
+
+    response = client.put("/employees/upsert", json={"gpn": "gpn_usc1", "employee_name": "John Smith"})
+    assert response.json() == {"inserted": 0, "updated": 1, "unchanged": 0}
+    assert client.get("/employees/GPN_USC1").json()["employee_name"] == "John Smith"
+
+
+@pytest.mark.real_db
+def test_upsert_when_team_does_not_exist(client):
+    response = client.put("/employees/upsert", json=[{"gpn": "GPN_USC5", "employee_name": "John Doe"},
+                                                     {"gpn": "GPN_USC6", "employee_name": "Jane Doe", "team_id": 100000}])
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Team with ID 100000 not found"
+    assert client.get("/employees/GPN_USC5").status_code == 404
+
+
+@pytest.mark.real_db
+def test_upsert_batch_of_employees(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_USC1"}).json()
+    client.post("/employees/", json={"gpn": "GPN_USC2", "employee_name": "John Doe"})
+    client.post("/employees/", json={"gpn": "GPN_USC3", "employee_name": "Davis Smith"})
+
+    response = client.put("/employees/upsert", json=[
+        {"gpn": "GPN_USC2", "employee_name": "John Doe"},
+        {"gpn": "GPN_USC3", "employee_name": "Davis Smith", "team_id": team["team_id"]},
+        {"gpn": "GPN_USC4", "employee_name": "Alice Smith"},
+    ])
+
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 1, "updated": 1, "unchanged": 1}
+    assert client.get("/employees/GPN_USC3").json()["team_id"] == team["team_id"]
+    assert client.get("/employees/GPN_USC4").status_code == 200
+
+
+@pytest.mark.real_db
+def test_upsert_employees_rejects_invalid_rows(client):
+    response = client.put("/employees/upsert", json=[{"gpn": "GPN_USC5"}])
+    assert response.status_code == 422
+
+
+@pytest.mark.real_db
+def test_bulk_delete_employees(client):
+    client.post("/employees/", json={"gpn": "GPN_BDC1", "employee_name": "John Doe"})
+    client.post("/employees/", json={"gpn": "GPN_BDC2", "employee_name": "Davis Smith"})
+
+    response = client.post("/employees/bulk/delete", json={"gpns": ["gpn_bdc1", "GPN_BDC2", "GPN_BDC3", "GPN_BDC1"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": ["GPN_BDC1", "GPN_BDC2"], "not_found": ["GPN_BDC3"]}
+    assert client.get("/employees/GPN_BDC1").status_code == 404
+    assert client.get("/employees/GPN_BDC2").status_code == 404
+
+
+@pytest.mark.real_db
+def test_bulk_delete_employees_empty_list(client):
+    response = client.post("/employees/bulk/delete", json={"gpns": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.real_db
+def test_import_employees_streams_report(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_IEC1"}).json()
+    body = "gpn,employee_name,team_name\nGPN_IEC1,john doe,team_iec1\nGPN_IEC2,,\n"
+
+    response = client.post("/employees/import", params={"format": "csv"}, content=body,
+                           headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["progress", "rejected", "summary"]
+    assert events[-1]["accepted"] == 1
+    assert client.get("/employees/GPN_IEC1").json()["team_id"] == team["team_id"]
+
+
+@pytest.mark.real_db
+def test_import_employees_invalid_format(client):
+    response = client.post("/employees/import", params={"format": "xml"}, content="")
+    assert response.status_code == 422
+
+
+@pytest.mark.real_db
+def test_get_employee_by_gpn_not_modified_until_gpn_changes(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_ETC7"}).json()
+    client.post("/employees/", json={"gpn": "GPN_ETC1", "employee_name": "John Doe", "team_id": team["team_id"]})
+    etag = client.get("/employees/GPN_ETC1").headers["ETag"]
+
+    with patch("app.employees.services.get_employee_by_gpn") as get_employee:
+        cached = client.get("/employees/GPN_ETC1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    get_employee.assert_not_called()
+
+    client.put("/employees/GPN_ETC1", json={"gpn": "GPN_ETC2", "employee_name": "John Doe",
+                                            "team_id": team["team_id"]})
+    assert client.get("/employees/GPN_ETC1", headers={"If-None-Match": etag}).status_code == 404
+
+
+@pytest.mark.real_db
+def test_get_all_employees_not_modified_until_team_deleted(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_ETC8"}).json()
+    client.post("/employees/", json={"gpn": "GPN_ETC3", "employee_name": "John Doe", "team_id": team["team_id"]})
+    etag = client.get("/employees/").headers["ETag"]
+    assert client.get("/employees/export").headers["ETag"] == etag
+
+    assert client.get("/employees/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.delete(f"/teams/{team['team_id']}")
+    assert client.get("/employees/", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.real_db
+def test_get_all_employees_cached_body_refreshes_after_update(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_BEC1"}).json()
+    client.post("/employees/", json={"gpn": "GPN_BEC1", "employee_name": "John Doe", "team_id": team["team_id"]})
+    first = client.get("/employees/")
+
+    with patch("app.employees.services.get_employees_json") as get_employees_json:
+        assert client.get("/employees/").content == first.content
+    get_employees_json.assert_not_called()
+
+    client.put("/employees/GPN_BEC1", json={"gpn": "GPN_BEC1", "employee_name": "Jane Doe",
+                                            "team_id": team["team_id"]})
+    employees = client.get("/employees/").json()
+    assert any(employee["employee_name"] == "Jane Doe" for employee in employees)
+
+
+@pytest.mark.real_db
+def test_get_all_employees_with_team_names_in_one_statement(client, statements):
+    teams = [client.post("/teams/", json={"team_name": f"TEAM_NEC{i}"}).json() for i in range(3)]
+    for i in range(30):
+        client.post("/employees/", json={"gpn": f"GPN_NEC{i}", "employee_name": "John Doe",
+                                         "team_id": teams[i % 3]["team_id"]})
+    statements.clear()
+
+    employees = client.get("/employees/").json()
+
+    assert len(statements) == 1
+    assert {employee["team_name"] for employee in employees if employee["gpn"].startswith("GPN_NEC")} == {
+        team["team_name"] for team in teams}
+
+
+@pytest.mark.real_db
+def test_team_rename_refreshes_employee_team_name(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_NEC100"}).json()
+    created = client.post("/employees/", json={"gpn": "GPN_NEC100", "employee_name": "John Doe",
+                                               "team_id": team["team_id"]}).json()
+    assert created["team_name"] == "TEAM_NEC100"
+    etag = client.get("/employees/GPN_NEC100").headers["ETag"]
+    list_etag = client.get("/employees/").headers["ETag"]
+
+    client.put(f"/teams/{team['team_id']}", json={"team_name": "TEAM_NEC101"})
+
+    response = client.get("/employees/GPN_NEC100", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["team_name"] == "TEAM_NEC101"
+    response = client.get("/employees/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert any(employee["team_name"] == "TEAM_NEC101" for employee in response.json())
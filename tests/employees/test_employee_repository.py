@@ -2,7 +2,9 @@ import pytest
 
 from app.employees.repository import employee_repo
 from app.employees import models as employee_models
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from app.exceptions import EmployeeGpnExistsException, TeamNotFoundException
 
 from tests.employees import employee_helper
 
@@ -52,10 +54,10 @@ def test_create_employee_with_invalid_team_id_type(test_db):
         team_id="invalid"
     )
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(TeamNotFoundException) as exc_info:
         employee_repo.create(employee, test_db)
 
-    assert "FOREIGN KEY constraint failed" in str(exc_info.value)
+    assert "FOREIGN KEY constraint failed" in str(exc_info.value.__context__)
 
 
 @pytest.mark.real_db
@@ -66,10 +68,21 @@ def test_create_employee_when_team_does_not_exist(test_db):
         team_id=10000
     )
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(TeamNotFoundException) as exc_info:
         employee_repo.create(employee, test_db)
 
-    assert "FOREIGN KEY constraint failed" in str(exc_info.value)
+    assert exc_info.value.detail == "Team with ID 10000 not found"
+    assert "FOREIGN KEY constraint failed" in str(exc_info.value.__context__)
+
+
+@pytest.mark.real_db
+def test_bulk_insert_when_team_does_not_exist(test_db):
+    rows = [{"gpn": "GPN102", "employee_name": "Bob Johnson", "team_id": 10000}]
+
+    with pytest.raises(TeamNotFoundException):
+        employee_repo.bulk_insert(rows, test_db)
+
+    assert employee_repo.get_all(test_db) == []
 
 
 @pytest.mark.real_db
@@ -82,10 +95,11 @@ def test_create_employee_when_duplicate_gpn(test_db):
         team_id=details[1].team_id
     )
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(EmployeeGpnExistsException) as exc_info:
         employee_repo.create(employee, test_db)
 
-    assert "UNIQUE constraint failed: employees.gpn" in str(exc_info.value)
+    assert "GPN GPN101 already exists" in str(exc_info.value)
+    assert "UNIQUE constraint failed: employees.gpn" in str(exc_info.value.__context__)
 
 
 @pytest.mark.real_db
@@ -184,10 +198,11 @@ def test_update_employee_with_existing_gpn(test_db):
 
     employee2.gpn = "GPN106"
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(EmployeeGpnExistsException) as exc_info:
         employee_repo.update(employee2, test_db)
 
-    assert "UNIQUE constraint failed: employees.gpn" in str(exc_info.value)
+    assert "GPN GPN106 already exists" in str(exc_info.value)
+    assert "UNIQUE constraint failed: employees.gpn" in str(exc_info.value.__context__)
 
 
 @pytest.mark.real_db
@@ -205,3 +220,70 @@ def test_delete_employee(test_db):
 def test_delete_employee_not_found(test_db):
     with pytest.raises(InvalidRequestError):
         employee_repo.delete(employee_models.Employee(gpn="GPN109", employee_name="John Doe"), test_db)
+
+
+@pytest.mark.real_db
+def test_get_all_employees_loads_teams_in_one_statement(test_db, statements):
+    teams = [employee_helper.create_test_team(f"TEAM_ERJ{i}", test_db) for i in range(5)]
+    test_db.add_all(employee_models.Employee(gpn=f"GPN_ERJ{i}", employee_name=f"Employee {i}",
+                                             team_id=teams[i % 5].team_id if i % 7 else None)
+                    for i in range(50))
+    test_db.commit()
+    test_db.expunge_all()
+    statements.clear()
+
+    employees = employee_repo.get_all(test_db)
+    team_names = {employee.gpn: employee.team_name for employee in employees}
+
+    assert len(statements) == 1
+    assert team_names["GPN_ERJ1"] == "TEAM_ERJ1"
+    assert team_names["GPN_ERJ7"] is None
+
+
+@pytest.mark.real_db
+def test_get_employee_by_gpn_cached_with_team(test_db, statements):
+    employee_helper.create_test_employee("GPN_ERJ100", "Alice Smith", "TEAM_ERJ100", test_db)
+    employee_repo.get_by_field("gpn", "GPN_ERJ100", test_db)
+    test_db.expunge_all()
+    statements.clear()
+
+    employee = employee_repo.get_by_field("gpn", "GPN_ERJ100", test_db)
+
+    assert employee.team_name == "TEAM_ERJ100"
+    assert statements == []
+
+
+@pytest.mark.real_db
+def test_update_returning_reloads_team(test_db):
+    employee, team = employee_helper.create_test_employee("GPN_ERJ101", "Alice Smith", "TEAM_ERJ101", test_db)
+    other_team = employee_helper.create_test_team("TEAM_ERJ102", test_db)
+    assert employee.team_name == "TEAM_ERJ101"
+
+    employee_repo.update_returning(employee, {"team_id": other_team.team_id}, test_db)
+
+    assert employee.team_name == "TEAM_ERJ102"
+
+
+@pytest.mark.real_db
+def test_get_page_for_team(test_db):
+    team = employee_helper.create_test_team("TEAM_ERP1", test_db)
+    other_team = employee_helper.create_test_team("TEAM_ERP2", test_db)
+    test_db.add_all(employee_models.Employee(gpn=f"GPN_ERP{i}", employee_name=f"Employee {i}",
+                                             team_id=team.team_id if i % 2 else other_team.team_id)
+                    for i in range(10))
+    test_db.commit()
+
+    first_page = employee_repo.get_page(None, 3, test_db, team_id=team.team_id)
+    next_page = employee_repo.get_page(first_page[-1].employee_id, 3, test_db, team_id=team.team_id)
+
+    assert [employee.gpn for employee in first_page + next_page] == [f"GPN_ERP{i}" for i in (1, 3, 5, 7, 9)]
+
+
+@pytest.mark.real_db
+def test_team_roster_query_seeks_on_team_index(test_db):
+    plan = test_db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM employees WHERE team_id = 1 AND employee_id > 10 "
+        "ORDER BY employee_id LIMIT 100")).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_employees_team_id_employee_id" in details
+    assert "TEMP B-TREE" not in details
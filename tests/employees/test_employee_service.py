@@ -1,10 +1,11 @@
+import json
 import pytest
 from pydantic import ValidationError
-from sqlalchemy.exc import IntegrityError
 
 from app.employees import services as employee_services
 from app.employees import schemas as employee_schema
-from app.exceptions import EmployeeGpnExistsException, EmployeeNotFoundException
+from app.teams import services as team_services
+from app.exceptions import EmployeeGpnExistsException, EmployeeNotFoundException, TeamNotFoundException
 
 from tests.employees import employee_helper
 
@@ -72,10 +73,10 @@ def test_create_employee_with_invalid_team_id(test_db):
         team_id=100000
     )
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(TeamNotFoundException) as exc_info:
         employee_services.create_employee(employee_request, test_db)
 
-    assert "FOREIGN KEY constraint failed" in str(exc_info.value)
+    assert exc_info.value.detail == "Team with ID 100000 not found"
 
 
 @pytest.mark.real_db
@@ -181,6 +182,39 @@ def test_update_employee_with_different_gpn_valid(test_db):
     assert updated_employee.team_id == team.team_id
 
 
+@pytest.mark.real_db
+def test_update_employee_gpn_evicts_cached_gpns(test_db):
+    gpn = "GPN_UES9"
+    created_employee, team = employee_helper.create_test_employee(gpn, "Alice Smith", "TEAM_UES9", test_db)
+    employee_services.get_employee_by_gpn(gpn, test_db)
+    with pytest.raises(EmployeeNotFoundException):
+        employee_services.get_employee_by_gpn("GPN_UES9_NEW", test_db)
+    employee_request = employee_schema.EmployeeUpdateRequest(
+        gpn="GPN_UES9_NEW",
+        employee_name="Alice Smith",
+        team_id=team.team_id
+    )
+
+    employee_services.update_employee(gpn, employee_request, test_db)
+    test_db.expunge_all()
+
+    with pytest.raises(EmployeeNotFoundException):
+        employee_services.get_employee_by_gpn(gpn, test_db)
+    assert employee_services.get_employee_by_gpn("GPN_UES9_NEW", test_db).employee_id == created_employee.employee_id
+
+
+@pytest.mark.real_db
+def test_delete_team_evicts_cached_employees(test_db):
+    gpn = "GPN_UES10"
+    created_employee, team = employee_helper.create_test_employee(gpn, "Alice Smith", "TEAM_UES10", test_db)
+    employee_services.get_employee_by_gpn(gpn, test_db)
+
+    team_services.delete_team(team.team_id, test_db)
+    test_db.expunge_all()
+
+    assert employee_services.get_employee_by_gpn(gpn, test_db).team_id is None
+
+
 @pytest.mark.real_db
 def test_update_employee_with_existing_gpn(test_db):
     employee1, team1 = employee_helper.create_test_employee("GPN_UES5", "Alice Smith", "TEAM_UES5", test_db)
@@ -210,10 +244,10 @@ def test_update_employee_with_invalid_team_name(test_db):
         team_id=100000
     )
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(TeamNotFoundException) as exc_info:
         employee_services.update_employee(gpn, employee_request, test_db)
 
-    assert "FOREIGN KEY constraint failed" in str(exc_info.value)
+    assert exc_info.value.detail == "Team with ID 100000 not found"
 
 
 @pytest.mark.real_db
@@ -371,3 +405,95 @@ def test_create_update_request_strip_whitespace_on_fields(schemas, gpn_input, em
     assert employee.gpn == expected_gpn
     assert employee.employee_name == expected_name
     assert employee.team_id == 1
+
+
+@pytest.mark.real_db
+def test_export_employees_in_batches(test_db):
+    for i in range(5):
+        employee_helper.create_test_employee(f"GPN_EXS{i}", "Alice Smith", f"TEAM_EXS{i}", test_db)
+    total = len(employee_services.get_all_employees(test_db))
+
+    chunks = list(employee_services.export_employees(test_db, batch_size=2))
+
+    rows = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+    assert len(chunks) == -(-total // 2)
+    assert len(rows) == total
+    assert [row["employee_id"] for row in rows] == sorted(row["employee_id"] for row in rows)
+    assert {f"GPN_EXS{i}" for i in range(5)} <= {row["gpn"] for row in rows}
+
+
+@pytest.mark.real_db
+def test_bulk_create_employees(test_db):
+    employee_helper.create_test_employee("GPN_BCS1", "Alice Smith", "TEAM_BCS1", test_db)
+    requests = [
+        employee_schema.EmployeeCreateRequest(gpn="GPN_BCS1", employee_name="Alice Smith"),
+        employee_schema.EmployeeCreateRequest(gpn="gpn_bcs2", employee_name="bob johnson"),
+        employee_schema.EmployeeCreateRequest(gpn="GPN_BCS2", employee_name="Bob Johnson"),
+        employee_schema.EmployeeCreateRequest(gpn="GPN_BCS3", employee_name="Charlie Brown"),
+    ]
+
+    result = employee_services.bulk_create_employees(requests, test_db)
+
+    assert result.created == 2
+    assert result.duplicates == 2
+    assert [(row.gpn, row.status) for row in result.results] == [
+        ("GPN_BCS1", "duplicate"), ("GPN_BCS2", "created"), ("GPN_BCS2", "duplicate"), ("GPN_BCS3", "created")]
+    created = employee_services.get_employee_by_gpn("GPN_BCS2", test_db)
+    assert created.employee_id == result.results[1].employee_id
+    assert created.employee_name == "Bob Johnson"
+
+
+@pytest.mark.real_db
+def test_bulk_create_employees_with_invalid_team_id(test_db):
+    team_id = employee_helper.create_test_team("TEAM_BCS4", test_db).team_id
+    requests = [
+        employee_schema.EmployeeCreateRequest(gpn="GPN_BCS4", employee_name="Alice Smith", team_id=100000),
+        employee_schema.EmployeeCreateRequest(gpn="GPN_BCS5", employee_name="Bob Johnson", team_id=team_id),
+        employee_schema.EmployeeCreateRequest(gpn="GPN_BCS6", employee_name="Charlie Brown", team_id=100001),
+    ]
+
+    result = employee_services.bulk_create_employees(requests, test_db)
+
+    assert result.created == 1
+    assert result.duplicates == 0
+    assert result.team_not_found == 2
+    assert [(row.gpn, row.status, row.employee_id is None) for row in result.results] == [
+        ("GPN_BCS4", "team_not_found", True), ("GPN_BCS5", "created", False), ("GPN_BCS6", "team_not_found", True)]
+    assert employee_services.get_employee_by_gpn("GPN_BCS5", test_db).team_id == team_id
+    with pytest.raises(EmployeeNotFoundException):
+        employee_services.get_employee_by_gpn("GPN_BCS4", test_db)
+
+
+@pytest.mark.real_db
+def test_import_employees(test_db):
+    team_id = employee_helper.create_test_team("TEAM_IES1", test_db).team_id
+    employee_helper.create_test_employee("GPN_IES1", "Alice Smith", "TEAM_IES2", test_db)
+    lines = [
+        "gpn,employee_name,team_name\n",
+        " gpn_ies1 ,alice jones,team_ies1\n",
+        "GPN_IES2,bob johnson,\n",
+        "GPN_IES3,Charlie Brown,TEAM_MISSING\n",
+        "G,Dan Brown,\n",
+    ]
+
+    events = list(employee_services.import_employees(lines, "csv", test_db, chunk_size=2))
+
+    summary = events[-1]
+    rejected = [event for event in events if event["event"] == "rejected"]
+    assert summary["event"] == "summary"
+    assert (summary["rows"], summary["accepted"], summary["rejected"]) == (4, 2, 2)
+    assert rejected[0] == {"event": "rejected", "row": 3, "error": "Team TEAM_MISSING not found"}
+    assert rejected[1]["row"] == 4 and "gpn" in rejected[1]["error"]
+    updated = employee_services.get_employee_by_gpn("GPN_IES1", test_db)
+    assert updated.employee_name == "Alice Jones"
+    assert updated.team_id == team_id
+    assert employee_services.get_employee_by_gpn("GPN_IES2", test_db).team_id is None
+
+
+@pytest.mark.real_db
+def test_import_employees_with_unknown_team_id(test_db):
+    events = list(employee_services.import_employees(
+        ['{"gpn": "GPN_IES4", "employee_name": "Alice Smith", "team_id": 100000}\n'], "ndjson", test_db))
+
+    assert events[-2] == {"event": "rejected", "row": 1, "error": "Team with ID 100000 not found"}
+    assert events[-1]["accepted"] == 0
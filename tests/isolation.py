@@ -0,0 +1,99 @@
+"""
+Test database plumbing: schema templates cloned with SQLite's backup API, and connections whose work, commits
+included, is rolled back when the test ends.
+"""
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from sqlalchemy import Connection, Engine, create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_schema
+from app.employees.models import Employee
+from app.teams.models import Team
+
+SEEDED_TEAMS = 100
+SEEDED_EMPLOYEES = 10_000
+
+
+def configure_test_engine(engine: Engine) -> Engine:
+    """
+    Turn on foreign keys and let the engine nest SAVEPOINTs inside an outer transaction. pysqlite's own
+    transaction handling gets in the way of SAVEPOINT, so the driver is put in autocommit mode and the
+    transaction statements are sent straight to it, which also keeps them out of the statement counts.
+    """
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    dialect = engine.dialect
+    dialect.do_begin = lambda dbapi_connection: dbapi_connection.execute("BEGIN")
+    dialect.do_savepoint = lambda connection, name: _driver_execute(connection, f"SAVEPOINT {name}")
+    dialect.do_release_savepoint = lambda connection, name: _driver_execute(connection, f"RELEASE SAVEPOINT {name}")
+    dialect.do_rollback_to_savepoint = lambda connection, name: _driver_execute(connection,
+                                                                                f"ROLLBACK TO SAVEPOINT {name}")
+    return engine
+
+
+def _driver_execute(connection: Connection, statement: str) -> None:
+    connection.connection.driver_connection.execute(statement)
+
+
+def seed_employees(connection: Connection, employees: int = SEEDED_EMPLOYEES, teams: int = SEEDED_TEAMS) -> None:
+    """``teams`` teams, TEAM_0001..., and ``employees`` employees, GPN000001..., assigned to them round robin."""
+    connection.execute(insert(Team), [{"team_id": i, "team_name": f"TEAM_{i:04d}"} for i in range(1, teams + 1)])
+    connection.execute(insert(Employee), [
+        {"employee_id": i, "gpn": f"GPN{i:06d}", "employee_name": f"Employee {i}", "team_id": (i - 1) % teams + 1}
+        for i in range(1, employees + 1)
+    ])
+
+
+def build_template(path: Path, seed: Callable[[Connection], None] | None = None) -> Path:
+    """
+    Write a database holding the schema, and whatever ``seed`` inserts, to ``path`` unless it is there already.
+    The file is built under a temporary name and moved into place, so parallel workers never see half of it.
+    """
+    if path.exists():
+        return path
+    building = path.with_name(f"{path.stem}-{uuid.uuid4().hex}{path.suffix}")
+    engine = create_engine(f"sqlite:///{building}")
+    create_schema(engine)
+    if seed is not None:
+        with engine.begin() as connection:
+            seed(connection)
+    engine.dispose()
+    os.replace(building, path)
+    return path
+
+
+def clone_database(template: Path, engine: Engine) -> None:
+    """Copy ``template`` into the database behind ``engine`` page by page with SQLite's backup API."""
+    source = sqlite3.connect(template)
+    target = engine.raw_connection()
+    try:
+        source.backup(target.driver_connection)
+    finally:
+        target.close()
+        source.close()
+
+
+@contextmanager
+def rolled_back(engine: Engine) -> Iterator[Connection]:
+    """A connection in a transaction that is rolled back on exit, however often sessions on it commit."""
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+
+
+def savepoint_sessions(connection: Connection) -> sessionmaker:
+    """Sessions on ``connection`` whose commits and rollbacks release or roll back a SAVEPOINT instead."""
+    return sessionmaker(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.database import QueryStats, query_stats
+from app.middleware import DB_QUERIES_HEADER
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """Fail when the request behind ``response`` ran more statements than its budget."""
+    count = int(response.headers[DB_QUERIES_HEADER])
+    assert count <= max_queries, (f"{response.request.method} {response.request.url.path} ran {count} statements, "
+                                  f"budget is {max_queries}")
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Fail when the code in the block, run on this thread, executes more statements than its budget."""
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+    assert stats.count <= max_queries, f"ran {stats.count} statements, budget is {max_queries}"
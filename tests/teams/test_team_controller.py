@@ -1,3 +1,7 @@
+import json
+from unittest.mock import patch
+
+
 def test_get_all_teams_returns_empty_list(client):
     response = client.get("/teams/")
     assert response.status_code == 200
@@ -85,3 +89,139 @@ def test_delete_employee(client):
 def test_delete_team_when_team_does_not_exist(client):
     response = client.delete("/teams/10000")
     assert response.status_code == 404
+
+
+def test_get_teams_paginated(client):
+    created = [client.post("/teams/", json={"team_name": f"TEAM_PTC{i}"}).json() for i in range(5)]
+
+    seen = []
+    response = client.get("/teams/", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(team["team_id"] for team in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get("/teams/", params={"limit": 2, "cursor": cursor})
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen))
+    assert all(team["team_id"] in seen for team in created)
+
+
+def test_get_teams_invalid_cursor(client):
+    response = client.get("/teams/", params={"limit": 2, "cursor": "invalid"})
+    assert response.status_code == 400
+
+
+def test_get_teams_invalid_limit(client):
+    response = client.get("/teams/", params={"limit": 0})
+    assert response.status_code == 422
+
+
+def test_import_teams_streams_report(client):
+    response = client.post("/teams/import", params={"format": "ndjson"},
+                           content='{"team_name": "team_itc1"}\n{"team_name": "team_itc2"}\n')
+
+    assert response.status_code == 200
+    summary = json.loads(response.text.splitlines()[-1])
+    assert summary["event"] == "summary"
+    assert summary["accepted"] == 2
+    team_names = [team["team_name"] for team in client.get("/teams/").json()]
+    assert "TEAM_ITC1" in team_names
+    assert "TEAM_ITC2" in team_names
+
+
+def test_get_teams_not_modified(client):
+    client.post("/teams/", json={"team_name": "TEAM_ETC1"})
+    response = client.get("/teams/")
+    etag = response.headers["ETag"]
+
+    cached = client.get("/teams/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    client.post("/teams/", json={"team_name": "TEAM_ETC2"})
+    response = client.get("/teams/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_get_team_by_id_not_modified(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_ETC3"}).json()
+    other_team = client.post("/teams/", json={"team_name": "TEAM_ETC4"}).json()
+    etag = client.get(f"/teams/{team['team_id']}").headers["ETag"]
+
+    assert client.get(f"/teams/{team['team_id']}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/teams/{other_team['team_id']}", json={"team_name": "TEAM_ETC5"})
+    assert client.get(f"/teams/{team['team_id']}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/teams/{team['team_id']}", json={"team_name": "TEAM_ETC6"})
+    response = client.get(f"/teams/{team['team_id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["team_name"] == "TEAM_ETC6"
+
+
+def test_get_teams_serves_cached_body(client):
+    client.post("/teams/", json={"team_name": "TEAM_BTC0"})
+    client.post("/teams/", json={"team_name": "TEAM_BTC1"})
+    first = client.get("/teams/", params={"limit": 1})
+
+    with patch("app.teams.services.get_teams_json") as get_teams_json:
+        second = client.get("/teams/", params={"limit": 1})
+    get_teams_json.assert_not_called()
+    assert second.content == first.content
+    assert second.headers["X-Next-Cursor"] == first.headers.get("X-Next-Cursor")
+
+    client.post("/teams/", json={"team_name": "TEAM_BTC2"})
+    assert any(team["team_name"] == "TEAM_BTC2" for team in client.get("/teams/").json())
+
+
+def test_get_teams_gzip(client):
+    for i in range(40):
+        client.post("/teams/", json={"team_name": f"TEAM_GTC{i}"})
+
+    response = client.get("/teams/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) >= 40
+
+    response = client.get("/teams/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert len(response.json()) >= 40
+
+
+def test_get_team_employees_paginated(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_RRC1"}).json()
+    other_team = client.post("/teams/", json={"team_name": "TEAM_RRC2"}).json()
+    for i in range(7):
+        client.post("/employees/", json={"gpn": f"GPN_RRC{i}", "employee_name": "John Doe",
+                                         "team_id": team["team_id"] if i % 2 else other_team["team_id"]})
+
+    seen = []
+    response = client.get(f"/teams/{team['team_id']}/employees", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        seen.extend(employee["gpn"] for employee in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get(f"/teams/{team['team_id']}/employees", params={"limit": 2, "cursor": cursor})
+
+    assert seen == ["GPN_RRC1", "GPN_RRC3", "GPN_RRC5"]
+    assert client.get("/employees/", params={"limit": 2}).json() != client.get(
+        f"/teams/{team['team_id']}/employees", params={"limit": 2}).json()
+
+
+def test_get_team_employees_empty_team(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_RRC3"}).json()
+    response = client.get(f"/teams/{team['team_id']}/employees")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_get_team_employees_when_team_does_not_exist(client):
+    response = client.get("/teams/10000/employees")
+    assert response.status_code == 404
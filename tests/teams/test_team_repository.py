@@ -3,6 +3,7 @@ import pytest
 from sqlalchemy.exc import IntegrityError, InvalidRequestError
 from app.teams.repository import team_repo
 from app.teams import models as team_models
+from app.exceptions import TeamNameExistsException
 
 
 def test_get_all_teams_empty(test_db):
@@ -26,10 +27,11 @@ def test_create_team_with_duplicate_name(test_db):
     team_repo.create(team, test_db)
 
     team = team_models.Team(team_name=team_name)
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(TeamNameExistsException) as exc_info:
         team_repo.create(team, test_db)
 
-    assert "UNIQUE constraint failed: teams.team_name" in str(exc_info.value)
+    assert f"Team {team_name} already exists" in str(exc_info.value)
+    assert "UNIQUE constraint failed: teams.team_name" in str(exc_info.value.__context__)
 
 
 def test_create_team_with_team_name_missing(test_db):
@@ -40,17 +42,6 @@ def test_create_team_with_team_name_missing(test_db):
     assert "NOT NULL constraint failed: teams.team_name" in str(exc_info.value)
 
 
-def test_get_team_by_name(test_db):
-    team_name = "TEAM_GT1"
-    team = team_models.Team(team_name=team_name)
-    team_repo.create(team, test_db)
-
-    team = team_repo.get_team_by_name(team_name, test_db)
-
-    assert team.team_name == team_name
-    assert team.team_id is not None
-
-
 def test_get_all_teams(test_db):
     team1 = team_models.Team(team_name="TEAM_GT2")
     team2 = team_models.Team(team_name="TEAM_GT3")
@@ -64,13 +55,6 @@ def test_get_all_teams(test_db):
     assert any(team.team_name == new_team2.team_name for team in teams)
 
 
-def test_get_team_by_name_not_found(test_db):
-    team_name = "TEAM_GT4"
-    team = team_repo.get_team_by_name(team_name, test_db)
-
-    assert team is None
-
-
 def test_update_team_name(test_db):
     team_name = "TEAM_UT1"
     team_model = team_models.Team(team_name=team_name)
@@ -88,10 +72,11 @@ def test_update_team_name_conflict(test_db):
 
     team2.team_name = "TeamA"
 
-    with pytest.raises(IntegrityError) as exc_info:
+    with pytest.raises(TeamNameExistsException) as exc_info:
         team_repo.update(team2, test_db)
 
-    assert "UNIQUE constraint failed: teams.team_name" in str(exc_info.value)
+    assert "Team TeamA already exists" in str(exc_info.value)
+    assert "UNIQUE constraint failed: teams.team_name" in str(exc_info.value.__context__)
 
 
 def test_delete_team(test_db):
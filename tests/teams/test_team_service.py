@@ -163,3 +163,18 @@ def test_create_update_request_field_length_validation(schemas, field_name, data
         schemas(**data)
 
     assert expected_message in str(exc_info.value)
+
+
+def test_import_teams(test_db):
+    team_services.create_team("TEAM_ITS1", test_db)
+    lines = ['{"team_name": "team_its1"}\n', '{"team_name": "team_its2"}\n', '{"team_name": "TEAM_ITS2"}\n',
+             '{"team_name": "a"}\n', "not json\n"]
+
+    events = list(team_services.import_teams(lines, "ndjson", test_db))
+
+    summary = events[-1]
+    assert (summary["rows"], summary["accepted"], summary["rejected"]) == (5, 3, 2)
+    assert [event["row"] for event in events if event["event"] == "rejected"] == [4, 5]
+    team_names = [team.team_name for team in team_services.get_all_teams(test_db)]
+    assert team_names.count("TEAM_ITS1") == 1
+    assert team_names.count("TEAM_ITS2") == 1
@@ -0,0 +1,32 @@
+import json
+
+from app import cli
+from app.teams import services as team_services
+from tests.isolation import savepoint_sessions
+
+
+def test_import_teams_from_csv(test_connection, test_db, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "engine", test_connection)
+    monkeypatch.setattr(cli, "SessionLocal", savepoint_sessions(test_connection))
+    path = tmp_path / "teams.csv"
+    path.write_text("team_name\nteam_cli1\nteam_cli2\n")
+
+    exit_code = cli.main(["import", "teams", str(path)])
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_code == 0
+    assert events[-1]["event"] == "summary"
+    assert events[-1]["accepted"] == 2
+    team_names = [team.team_name for team in team_services.get_all_teams(test_db)]
+    assert "TEAM_CLI1" in team_names
+    assert "TEAM_CLI2" in team_names
+
+
+def test_import_exits_non_zero_on_rejected_rows(test_connection, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "engine", test_connection)
+    monkeypatch.setattr(cli, "SessionLocal", savepoint_sessions(test_connection))
+    path = tmp_path / "teams.ndjson"
+    path.write_text('{"team_name": "x"}\n')
+
+    assert cli.main(["import", "teams", str(path)]) == 1
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["rejected"] == 1
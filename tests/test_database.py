@@ -0,0 +1,118 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import (QueryStats, apply_sqlite_pragmas, create_schema, get_sqlite_pragmas, engine,
+                          instrument_engine, query_stats, read_engine)
+from app.core.metrics import metrics_registry
+from app.dependencies import get_read_db
+
+
+def test_default_pragmas():
+    assert get_sqlite_pragmas() == {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-65536",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+        "foreign_keys": "ON",
+    }
+
+
+def test_pragmas_are_configurable_from_env(monkeypatch):
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("SQLITE_MMAP_SIZE", "")
+
+    pragmas = get_sqlite_pragmas()
+
+    assert pragmas["synchronous"] == "FULL"
+    assert "mmap_size" not in pragmas
+
+
+def test_apply_sqlite_pragmas(tmp_path):
+    connection = sqlite3.connect(tmp_path / "pragmas.db")
+
+    apply_sqlite_pragmas(connection, get_sqlite_pragmas())
+
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert connection.execute("PRAGMA cache_size").fetchone()[0] == -65536
+    assert connection.execute("PRAGMA temp_store").fetchone()[0] == 2
+    assert connection.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert connection.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    connection.close()
+
+
+@pytest.mark.real_db
+def test_application_engine_uses_pragmas():
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+
+@pytest.mark.real_db
+def test_read_engine_is_read_only():
+    with read_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA query_only")).scalar() == 1
+        assert connection.execute(text("SELECT count(*) FROM teams")).scalar() >= 0
+        with pytest.raises(OperationalError) as exc_info:
+            connection.execute(text("CREATE TABLE read_only_probe (id INTEGER)"))
+
+    assert "readonly" in str(exc_info.value)
+
+
+def test_get_read_db_uses_read_engine():
+    dependency = get_read_db()
+    db = next(dependency)
+    try:
+        assert db.get_bind() is read_engine
+    finally:
+        dependency.close()
+
+
+def test_create_schema_adds_indexes_to_existing_tables(tmp_path):
+    schema_engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    with schema_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE teams (team_id INTEGER PRIMARY KEY, team_name VARCHAR NOT NULL UNIQUE)"))
+        conn.execute(text("CREATE TABLE employees (employee_id INTEGER PRIMARY KEY, gpn VARCHAR NOT NULL UNIQUE, "
+                          "employee_name VARCHAR NOT NULL, team_id INTEGER REFERENCES teams (team_id))"))
+
+    create_schema(schema_engine)
+
+    indexes = {index["name"] for index in inspect(schema_engine).get_indexes("employees")}
+    assert "ix_employees_team_id_employee_id" in indexes
+    schema_engine.dispose()
+
+
+def test_instrument_engine_records_into_current_stats():
+    instrumented = create_engine("sqlite://")
+    instrument_engine(instrumented)
+    stats = QueryStats()
+
+    with instrumented.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        token = query_stats.set(stats)
+        try:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        finally:
+            query_stats.reset(token)
+        conn.execute(text("SELECT 3"))
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+
+
+def test_pool_checkout_wait_is_recorded():
+    def checkouts(pool: str) -> int:
+        body = metrics_registry.render()
+        prefix = f'db_pool_checkout_wait_seconds_count{{pool="{pool}"}} '
+        return next((int(line.removeprefix(prefix)) for line in body.splitlines() if line.startswith(prefix)), 0)
+
+    before = checkouts("write")
+    with engine.connect():
+        pass
+    assert checkouts("write") == before + 1
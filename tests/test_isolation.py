@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.employees import services as employee_services
+from app.employees.models import Employee
+from app.exceptions import TeamNameExistsException
+from app.teams import services as team_services
+from app.teams.models import Team
+from tests.isolation import (SEEDED_EMPLOYEES, SEEDED_TEAMS, build_template, clone_database, configure_test_engine,
+                             rolled_back, savepoint_sessions, seed_employees)
+
+
+def count(connection, model) -> int:
+    return connection.scalar(select(func.count()).select_from(model))
+
+
+def test_commits_are_rolled_back(test_engine):
+    with rolled_back(test_engine) as connection:
+        with savepoint_sessions(connection)() as db:
+            team_services.create_team("TEAM_ISO1", db)
+            team_services.create_team("TEAM_ISO2", db)
+        assert count(connection, Team) == 2
+
+    with test_engine.connect() as connection:
+        assert count(connection, Team) == 0
+
+
+def test_failed_commit_keeps_earlier_commits(test_db):
+    team_services.create_team("TEAM_ISO3", test_db)
+
+    with pytest.raises(TeamNameExistsException):
+        team_services.create_team("TEAM_ISO3", test_db)
+
+    assert [team.team_name for team in team_services.get_all_teams(test_db)] == ["TEAM_ISO3"]
+
+
+def test_clone_database(tmp_path):
+    template = build_template(tmp_path / "template.db", lambda connection: seed_employees(connection, 20, 2))
+    engine = configure_test_engine(create_engine("sqlite:///:memory:", poolclass=StaticPool))
+
+    clone_database(template, engine)
+
+    with engine.connect() as connection:
+        assert count(connection, Team) == 2
+        assert count(connection, Employee) == 20
+    assert build_template(template) == template  # Built once, then reused
+
+
+def test_seeded_db(seeded_db):
+    employee_services.delete_employee("GPN000001", seeded_db)
+
+    rows, cursor = employee_services.get_team_employees_page(SEEDED_TEAMS, None, 1000, seeded_db)
+    assert len(rows) == SEEDED_EMPLOYEES // SEEDED_TEAMS
+    assert cursor is None
+    assert len(employee_services.get_all_employees(seeded_db)) == SEEDED_EMPLOYEES - 1
+
+
+def test_seeded_db_is_rolled_back(seeded_db):
+    assert len(employee_services.get_all_employees(seeded_db)) == SEEDED_EMPLOYEES
@@ -0,0 +1,83 @@
+import json
+import logging
+import queue
+
+import pytest
+
+from app.loggers import (BoundedQueueHandler, DropReportingListener, JsonFormatter, SamplingFilter, parse_sampling)
+
+
+def make_record(message: str, name: str = "app_logger", level: int = logging.INFO) -> logging.LogRecord:
+    return logging.makeLogRecord({"name": name, "levelno": level, "levelname": logging.getLevelName(level),
+                                  "msg": message})
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_drop_new_when_queue_full():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+    for i in range(5):
+        handler.handle(make_record(f"message {i}"))
+
+    assert handler.dropped == 3
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ["message 0", "message 1"]
+
+
+def test_drop_oldest_when_queue_full():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "drop_oldest")
+    for i in range(5):
+        handler.handle(make_record(f"message {i}"))
+
+    assert handler.dropped == 3
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ["message 3", "message 4"]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), "block")
+
+
+def test_listener_writes_and_reports_drops():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+    output = ListHandler()
+    listener = DropReportingListener(log_queue, handler, output)
+    for i in range(4):
+        handler.handle(make_record(f"message {i}"))
+
+    listener.start()
+    listener.stop()
+
+    assert output.messages == ["message 0", "message 1", "Log queue was full, dropped 2 records"]
+
+
+def test_sampling_filter():
+    sampler = SamplingFilter({"app_logger": 0.0, "app_logger.verbose": 1.0})
+    assert not sampler.filter(make_record("info"))
+    assert sampler.filter(make_record("warning", level=logging.WARNING))
+    assert sampler.filter(make_record("child", name="app_logger.verbose.requests"))
+    assert sampler.filter(make_record("other", name="uvicorn"))
+
+
+def test_parse_sampling():
+    assert parse_sampling("app_logger=0.1, sqlalchemy.engine=0.01,") == {"app_logger": 0.1,
+                                                                         "sqlalchemy.engine": 0.01}
+    assert parse_sampling("") == {}
+
+
+def test_json_formatter():
+    record = make_record("hello %s")
+    record.args = ("world",)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app_logger"
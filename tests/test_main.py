@@ -0,0 +1,31 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.dependencies import get_read_db
+from app.exceptions import DATABASE_LOCKED_DETAIL
+from main import app
+
+
+def failing_db(message: str):
+    def get_db():
+        raise OperationalError("SELECT 1", {}, sqlite3.OperationalError(message))
+    return get_db
+
+
+def test_database_locked_returns_503(client):
+    app.dependency_overrides[get_read_db] = failing_db("database is locked")
+
+    response = client.get("/teams/")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": DATABASE_LOCKED_DETAIL}
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_other_operational_errors_are_not_mapped(client):
+    app.dependency_overrides[get_read_db] = failing_db("no such table: teams")
+
+    with pytest.raises(OperationalError):
+        client.get("/teams/")
@@ -0,0 +1,39 @@
+import re
+
+
+def sample(body: str, line_prefix: str) -> float:
+    match = re.search(rf"^{re.escape(line_prefix)} (\S+)$", body, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_by_route_template(client):
+    team = client.post("/teams/", json={"team_name": "TEAM_MTC1"}).json()
+    before = client.get("/metrics").text
+
+    client.get(f"/teams/{team['team_id']}")
+    client.get("/teams/10000")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    count = 'http_request_duration_seconds_count{method="GET",route="/teams/{team_id}"}'
+    assert sample(body, count) - sample(before, count) == 2
+    ok = 'http_requests_total{method="GET",route="/teams/{team_id}",status="200"}'
+    not_found = 'http_requests_total{method="GET",route="/teams/{team_id}",status="404"}'
+    assert sample(body, ok) - sample(before, ok) == 1
+    assert sample(body, not_found) - sample(before, not_found) == 1
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/teams/{team_id}",le="+Inf"}' in body
+    assert sample(body, "http_requests_in_flight") == 1  # The scrape itself
+
+
+def test_metrics_unmatched_route_and_caches(client):
+    client.get("/no/such/path")
+    client.get("/teams/")
+    client.get("/teams/")
+
+    body = client.get("/metrics").text
+
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in body
+    assert sample(body, 'cache_hits_total{cache="response"}') >= 1
+    assert 'cache_hit_ratio{cache="repository"}' in body
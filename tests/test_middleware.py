@@ -0,0 +1,41 @@
+import logging
+
+from app.middleware import REQUEST_ID_HEADER
+
+
+def test_request_id_generated(client):
+    first = client.get("/teams/")
+    second = client.get("/teams/")
+    assert len(first.headers[REQUEST_ID_HEADER]) == 32
+    assert first.headers[REQUEST_ID_HEADER] != second.headers[REQUEST_ID_HEADER]
+
+
+def test_request_id_echoed_and_logged(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app_logger"):
+        response = client.get("/teams/?limit=5", headers={REQUEST_ID_HEADER: "req-123"})
+
+    assert response.headers[REQUEST_ID_HEADER] == "req-123"
+    messages = [record.getMessage() for record in caplog.records if record.name == "app_logger"]
+    assert "Incoming request: GET /teams/?limit=5 [req-123]" in messages
+    completed = [message for message in messages if message.startswith("Completed response: 200 in ")]
+    assert len(completed) == 1
+    assert completed[0].endswith("[req-123]")
+
+
+def test_unmatched_route_logged_with_status(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app_logger"):
+        response = client.get("/no/such/path")
+
+    assert response.status_code == 404
+    assert REQUEST_ID_HEADER in response.headers
+    assert any(record.getMessage().startswith("Completed response: 404 in ") for record in caplog.records)
+
+
+def test_streamed_response_passes_through(client):
+    client.post("/employees/", json={"gpn": "GPN_MW1", "employee_name": "Alice Smith"})
+
+    response = client.get("/employees/export")
+
+    assert response.status_code == 200
+    assert REQUEST_ID_HEADER in response.headers
+    assert b"GPN_MW1" in response.content
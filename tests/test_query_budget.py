@@ -0,0 +1,78 @@
+import itertools
+
+import pytest
+
+from app.employees import services as employee_services
+from tests.query_budget import assert_query_budget, query_budget
+
+
+fixture_ids = itertools.count(1)
+
+
+@pytest.fixture
+def team(client):
+    return client.post("/teams/", json={"team_name": f"TEAM_QBF{next(fixture_ids)}"}).json()
+
+
+@pytest.fixture
+def employee(client, team):
+    return client.post("/employees/", json={"gpn": f"GPN_QBF{next(fixture_ids)}", "employee_name": "Alice Smith",
+                                            "team_id": team["team_id"]}).json()
+
+
+def test_headers(client, team):
+    response = client.get(f"/teams/{team['team_id']}")
+    assert response.headers["X-DB-Queries"] == "1"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["Server-Timing"].endswith('desc="1 queries"')
+
+
+def test_assert_query_budget_fails_over_budget(client, team):
+    with pytest.raises(AssertionError, match="ran 1 statements, budget is 0"):
+        assert_query_budget(client.get(f"/teams/{team['team_id']}"), 0)
+
+
+def test_create_team_budget(client):
+    assert_query_budget(client.post("/teams/", json={"team_name": "TEAM_QBT2"}), 1)
+
+
+def test_create_employee_budget(client, team):
+    response = client.post("/employees/", json={"gpn": "GPN_QBT2", "employee_name": "Alice Smith",
+                                                "team_id": team["team_id"]})
+    assert_query_budget(response, 2)
+
+
+def test_get_all_employees_budget(client, employee):
+    assert_query_budget(client.get("/employees/"), 1)
+    assert_query_budget(client.get("/employees/"), 0)
+
+
+def test_get_employee_budget(client, employee):
+    assert_query_budget(client.get(f"/employees/{employee['gpn']}"), 1)
+    assert_query_budget(client.get(f"/employees/{employee['gpn']}"), 0)
+
+
+def test_get_team_employees_budget(client, team, employee):
+    assert_query_budget(client.get(f"/teams/{team['team_id']}/employees"), 1)
+
+
+def test_update_employee_budget(client, team, employee):
+    response = client.put(f"/employees/{employee['gpn']}", json={"gpn": employee["gpn"], "employee_name": "Bob Smith",
+                                                                 "team_id": team["team_id"]})
+    assert_query_budget(response, 3)
+
+
+def test_delete_employee_budget(client, employee):
+    assert_query_budget(client.delete(f"/employees/{employee['gpn']}"), 2)
+
+
+def test_upsert_employees_budget(client, team):
+    rows = [{"gpn": f"GPN_QBT{i}", "employee_name": "Alice Smith", "team_id": team["team_id"]} for i in range(10, 60)]
+    # One team lookup, one existence lookup, then one INSERT ... ON CONFLICT per row
+    assert_query_budget(client.put("/employees/upsert", json=rows), len(rows) + 2)
+
+
+def test_service_budget(test_db, employee):
+    with query_budget(1) as stats:
+        employee_services.get_all_employees(test_db)
+    assert stats.count == 1